@@ -393,18 +393,13 @@ def _discover_static_roots() -> List[Path]:
             pass
 
     # Unique, order-preserving
-    seen: set[str] = set()
-    out: List[Path] = []
+    resolved: List[Path] = []
     for r in roots:
         try:
-            rp = r.resolve()
+            resolved.append(r.resolve())
         except Exception:
             continue
-        key = str(rp)
-        if key not in seen:
-            seen.add(key)
-            out.append(rp)
-    return out
+    return list(dict.fromkeys(resolved))
 
 
 def _static_max_age(app: Flask, filename: str) -> int:
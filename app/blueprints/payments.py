@@ -74,6 +74,9 @@ except Exception:
 # ----------------------------
 # Small utilities
 # ----------------------------
+_TRUTHY = frozenset({"1", "true", "yes", "on", "y"})
+
+
 def _cfg(key: str, default: str = "") -> str:
     v = current_app.config.get(key)
     if isinstance(v, str) and v.strip():
@@ -88,7 +91,7 @@ def _cfg_bool(key: str, default: bool = False) -> bool:
     raw = (os.getenv(key, "") or "").strip().lower()
     if not raw:
         return default
-    return raw in {"1", "true", "yes", "on", "y"}
+    return raw in _TRUTHY
 
 
 def _truthy(v: Any) -> bool:
@@ -96,8 +99,8 @@ def _truthy(v: Any) -> bool:
         return v
     if v is None:
         return False
-    s = str(v).strip().lower()
-    return s in {"1", "true", "yes", "on", "y"}
+    s = v if isinstance(v, str) else str(v)
+    return s.strip().lower() in _TRUTHY
 
 
 def _is_email(s: str) -> bool:
@@ -185,7 +188,7 @@ def _gross_up_cover_fees(base_cents: int, fee_pct: Decimal, fee_flat: Decimal) -
 # ----------------------------
 # Settings
 # ----------------------------
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Settings:
     env: str
     platform: str
@@ -254,13 +257,13 @@ class Settings:
 # ----------------------------
 # Normalized request model
 # ----------------------------
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Donor:
     name: str
     email: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IntentRequest:
     amount_cents_raw: Any
     currency: str
@@ -324,7 +327,7 @@ def _parse_amount_cents(raw: Any) -> Tuple[Optional[int], Optional[str]]:
     return n, None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AmountBreakdown:
     base_cents: int
     round_up_add_cents: int
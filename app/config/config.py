@@ -35,8 +35,9 @@ def _csv(val: Union[str, Sequence[str], None]) -> list[str]:
     if not val:
         return []
     if isinstance(val, str):
-        return [p.strip() for p in val.split(",") if p.strip()]
-    return [str(x).strip() for x in val if str(x).strip()]
+        return [p for p in (q.strip() for q in val.split(",")) if p]
+    # Only coerce non-str items; typical inputs are already strings.
+    return [p for p in (x.strip() if isinstance(x, str) else str(x).strip() for x in val) if p]
 
 
 def _normalize_db(url: str) -> str:
@@ -3,11 +3,13 @@ from datetime import datetime
 from typing import Any, Dict, Optional
 
 import sqlalchemy as sa
-from sqlalchemy import Boolean, ForeignKey, Integer, String, Index, event
+from sqlalchemy import Boolean, ForeignKey, Integer, Index, event
 from sqlalchemy.orm import Mapped, mapped_column, object_session, relationship
 
 from app.extensions import db
 
+from .mixins import UUID_TYPE
+
 
 class CampaignGoal(db.Model):
     __tablename__ = "campaign_goals"
@@ -23,7 +25,7 @@ class CampaignGoal(db.Model):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     uuid: Mapped[str] = mapped_column(
-        String(36),
+        UUID_TYPE,
         unique=True,
         nullable=False,
         default=lambda: str(_uuid.uuid4()),
@@ -11,13 +11,13 @@ from typing import Any, Dict, Optional
 from urllib.parse import urlparse
 
 from flask import g
-from sqlalchemy import CheckConstraint, Index, event, select
+from sqlalchemy import CheckConstraint, Index, event, select, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.extensions import db
 from app.models.org import Org
 
-from .mixins import SoftDeleteMixin, TimestampMixin
+from .mixins import SoftDeleteMixin, TimestampMixin, soft_delete_indexes
 
 DONATION_TIERS = ("Platinum", "Gold", "Silver", "Bronze", "Supporter")
 
@@ -26,9 +26,22 @@ class Donation(db.Model, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "donations"
     __table_args__ = (
         CheckConstraint("amount_cents >= 0", name="ck_donations_amount_nonneg"),
-        Index("ix_donations_team_status", "team_id", "deleted_at"),
-        Index("ix_donations_goal", "campaign_goal_id"),
-        Index("ix_donations_org", "org_id"),  # ⚡ speeds up multi-tenant filtering
+        # Recent active donations per team; deleted_at is a predicate, not a key column
+        Index(
+            "ix_donations_team_active",
+            "team_id",
+            "created_at",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # Goal progress recompute (SUM(amount_cents) by goal + paid status) is answered index-only on Postgres
+        Index(
+            "ix_donations_goal_status",
+            "campaign_goal_id",
+            "provider_status",
+            postgresql_include=["amount_cents"],
+        ),
+        *soft_delete_indexes("donations"),
     )
     # ---- Identifiers ----
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -74,8 +87,7 @@ class Donation(db.Model, TimestampMixin, SoftDeleteMixin):
     )
     campaign_goal_id: Mapped[Optional[int]] = mapped_column(
         db.ForeignKey("campaign_goals.id", ondelete="SET NULL"),
-        index=True,
-        nullable=True,
+        nullable=True,  # indexed via ix_donations_goal_status (leading column)
     )
     campaign_goal: Mapped[Optional["CampaignGoal"]] = relationship(
         "CampaignGoal", back_populates="donations", lazy="joined"
@@ -1,12 +1,18 @@
 # app/models/mixins.py
-"""Shared SQLAlchemy mixins for timestamps and soft deletes."""
+"""Shared SQLAlchemy mixins for timestamps and soft deletes, plus shared column types."""
 
 from datetime import datetime
 
+import sqlalchemy as sa
 from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
 
 from app.extensions import db
 
+# Public identifiers: VARCHAR(36) on SQLite, native 16-byte UUID on Postgres (values stay str).
+# Migration cfc27512bb98 converts existing columns to the same type (kept in sync by tests).
+UUID_TYPE = sa.String(36).with_variant(postgresql.UUID(as_uuid=False), "postgresql")
+
 
 class TimestampMixin:
     """Adds created_at and updated_at columns with auto-refresh behavior."""
@@ -32,11 +38,31 @@ class TimestampMixin:
         event.listen(cls, "before_update", cls._set_updated_at)
 
 
+# Soft-delete index predicates: active rows are the overwhelming majority, so only
+# trashed rows are indexed. Migration a5263708d0b1 builds the same partial indexes
+# (tests/test_migration_parity.py keeps the two in sync).
+SOFT_DELETE_INDEX_WHERE = (("deleted", "deleted"), ("deleted_at", "deleted_at IS NOT NULL"))
+
+
+def soft_delete_indexes(table: str) -> tuple[sa.Index, ...]:
+    """Partial ix_<table>_deleted / ix_<table>_deleted_at for a SoftDeleteMixin model's __table_args__."""
+    return tuple(
+        sa.Index(
+            f"ix_{table}_{column}",
+            column,
+            postgresql_where=sa.text(predicate),
+            sqlite_where=sa.text(predicate),
+        )
+        for column, predicate in SOFT_DELETE_INDEX_WHERE
+    )
+
+
 class SoftDeleteMixin:
     """Adds soft-delete support with deleted flag and deleted_at timestamp."""
 
-    deleted = db.Column(db.Boolean, default=False, nullable=False, index=True)
-    deleted_at = db.Column(db.DateTime, nullable=True, index=True)
+    # Indexed via soft_delete_indexes() in each model's __table_args__ (partial, trashed rows only)
+    deleted = db.Column(db.Boolean, default=False, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=True)
 
     def soft_delete(self, commit: bool = True) -> None:
         """Mark the record as deleted without removing it from DB."""
@@ -3,13 +3,14 @@ from __future__ import annotations
 from typing import Optional
 
 from app.extensions import db
-from app.models.mixins import SoftDeleteMixin, TimestampMixin
+from app.models.mixins import SoftDeleteMixin, TimestampMixin, soft_delete_indexes
 
 
 class Org(db.Model, TimestampMixin, SoftDeleteMixin):
     """Represents an organization, team, or club within the fundraiser platform."""
 
     __tablename__ = "orgs"
+    __table_args__ = soft_delete_indexes("orgs")
 
     id = db.Column(db.Integer, primary_key=True)
     slug = db.Column(db.String(80), unique=True, nullable=False, index=True)
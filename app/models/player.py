@@ -5,18 +5,19 @@ from typing import Any, Dict
 
 from app.extensions import db
 
-from .mixins import SoftDeleteMixin, TimestampMixin
+from .mixins import UUID_TYPE, SoftDeleteMixin, TimestampMixin, soft_delete_indexes
 
 
 class Player(db.Model, TimestampMixin, SoftDeleteMixin):
     """An AAU player on the roster."""
 
     __tablename__ = "players"
+    __table_args__ = soft_delete_indexes("players")
 
     # ── Identity ────────────────────────────────────────────────
     id = db.Column(db.Integer, primary_key=True)
     uuid = db.Column(
-        db.String(36),
+        UUID_TYPE,
         unique=True,
         nullable=False,
         default=lambda: str(uuid.uuid4()),
@@ -13,19 +13,16 @@ from sqlalchemy import CheckConstraint
 
 from app.extensions import db
 
-from .mixins import SoftDeleteMixin, TimestampMixin
+from .mixins import SoftDeleteMixin, TimestampMixin, soft_delete_indexes
 
 
 class SMSLog(db.Model, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "sms_logs"
     __table_args__ = (
-        CheckConstraint("length(from_number) <= 32", name="ck_sms_from_len"),
-        CheckConstraint("length(to_number)   <= 32", name="ck_sms_to_len"),
-        # REMOVED duplicate:         Index("ix_sms_logs_created", "created_at"),
-        # REMOVED duplicate:         Index("ix_sms_logs_direction", "direction"),
-        # REMOVED duplicate:         Index("ix_sms_logs_status", "status"),
-        # REMOVED duplicate:         Index("ix_sms_logs_to", "to_number"),
-        # REMOVED duplicate:         Index("ix_sms_logs_from", "from_number"),
+        # SQLite doesn't enforce VARCHAR(32); elsewhere the column type already bounds it
+        CheckConstraint("length(from_number) <= 32", name="ck_sms_from_len").ddl_if(dialect="sqlite"),
+        CheckConstraint("length(to_number)   <= 32", name="ck_sms_to_len").ddl_if(dialect="sqlite"),
+        *soft_delete_indexes("sms_logs"),
     )
     id = db.Column(db.Integer, primary_key=True)
     # Core parties
@@ -12,7 +12,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.extensions import db
 from app.models.org import Org
 
-from .mixins import SoftDeleteMixin, TimestampMixin
+from .mixins import SoftDeleteMixin, TimestampMixin, soft_delete_indexes
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Constants / Config
@@ -53,7 +53,16 @@ class Sponsor(db.Model, TimestampMixin, SoftDeleteMixin):
     __table_args__ = (
         CheckConstraint("amount >= 0", name="ck_sponsors_amount_nonneg"),
         Index("ix_sponsors_status_amount", "status", "amount"),
-        Index("ix_sponsors_org", "org_id"),
+        # Org-scoped leaderboard: WHERE org_id=? AND status=? ORDER BY amount DESC (backward range scan);
+        # name/tier ride along on Postgres so the leaderboard columns come from the index
+        Index(
+            "ix_sponsors_org_status_amount",
+            "org_id",
+            "status",
+            "amount",
+            postgresql_include=["name", "tier"],
+        ),
+        *soft_delete_indexes("sponsors"),
     )
 
     # ── Identifiers ────────────────────────────────────────────────
@@ -63,8 +72,7 @@ class Sponsor(db.Model, TimestampMixin, SoftDeleteMixin):
     # ── Relationships ───────────────────────────────────────────────
     org_id: Mapped[Optional[int]] = mapped_column(
         ForeignKey("orgs.id", ondelete="CASCADE"),
-        nullable=True,
-        index=True,
+        nullable=True,  # indexed via ix_sponsors_org_status_amount (leading column)
         doc="Owning Org (tenant/team/school)",
     )
     org: Mapped[Optional["Org"]] = relationship(
@@ -94,8 +102,7 @@ class Sponsor(db.Model, TimestampMixin, SoftDeleteMixin):
     status: Mapped[str] = mapped_column(
         String(32),
         default="pending",
-        nullable=False,
-        index=True,
+        nullable=False,  # indexed via ix_sponsors_status_amount (leading column)
         doc=f"Payment status: {', '.join(SPONSOR_STATUSES)}",
     )
 
@@ -12,21 +12,19 @@ from sqlalchemy import Index
 
 from app.extensions import db
 
-from .mixins import SoftDeleteMixin, TimestampMixin
+from .mixins import SoftDeleteMixin, TimestampMixin, soft_delete_indexes
 
 
 class SponsorClick(db.Model, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "sponsor_clicks"
     __table_args__ = (
-        Index("ix_clicks_created", "created_at"),
         Index("ix_clicks_tenant_surface", "tenant", "surface"),
-        Index("ix_clicks_name", "name"),
+        *soft_delete_indexes("sponsor_clicks"),
     )
     id = db.Column(db.Integer, primary_key=True)
     # tenancy + display context
-    tenant = db.Column(
-        db.String(120), nullable=True, index=True, doc="Team/tenant slug"
-    )
+    # indexed via ix_clicks_tenant_surface (leading column)
+    tenant = db.Column(db.String(120), nullable=True, doc="Team/tenant slug")
     name = db.Column(
         db.String(255), nullable=True, index=True, doc="Sponsor display name"
     )
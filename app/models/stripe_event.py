@@ -28,8 +28,7 @@ class StripeEvent(db.Model, TimestampMixin):
 
     type: Mapped[str] = mapped_column(
         db.String(120),
-        index=True,
-        nullable=False,
+        nullable=False,  # indexed via ix_stripe_events_type_created (leading column)
         doc="Stripe event type (payment_intent.succeeded, etc)",
     )
 
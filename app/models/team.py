@@ -19,7 +19,7 @@ from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.extensions import db
-from .mixins import SoftDeleteMixin, TimestampMixin
+from .mixins import UUID_TYPE, SoftDeleteMixin, TimestampMixin, soft_delete_indexes
 
 if TYPE_CHECKING:
     from .campaign_goal import CampaignGoal
@@ -62,12 +62,13 @@ class Team(db.Model, TimestampMixin, SoftDeleteMixin):
     """Brand & theme configuration for a team, plus roster, sponsors & stats."""
 
     __tablename__ = "teams"
+    __table_args__ = soft_delete_indexes("teams")
 
     # ── Identity ────────────────────────────────────────────────
     id: Mapped[int] = mapped_column(sa.Integer, primary_key=True)
 
     uuid: Mapped[str] = mapped_column(
-        sa.String(36),
+        UUID_TYPE,
         unique=True,
         nullable=False,
         default=lambda: str(uuid.uuid4()),
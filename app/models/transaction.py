@@ -9,11 +9,11 @@ Can be linked to Sponsors and Campaign Goals.
 
 import uuid as _uuid
 
-from sqlalchemy import CheckConstraint, Index
+from sqlalchemy import CheckConstraint
 
 from app.extensions import db
 
-from .mixins import SoftDeleteMixin, TimestampMixin
+from .mixins import UUID_TYPE, SoftDeleteMixin, TimestampMixin, soft_delete_indexes
 
 
 class Transaction(db.Model, TimestampMixin, SoftDeleteMixin):
@@ -22,15 +22,13 @@ class Transaction(db.Model, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "transactions"
     __table_args__ = (
         CheckConstraint("amount_cents >= 0", name="ck_tx_amount_nonneg"),
-        Index("ix_tx_goal", "campaign_goal_id"),
-        Index("ix_tx_sponsor", "sponsor_id"),
-        Index("ix_tx_status", "status"),
+        *soft_delete_indexes("transactions"),
     )
 
     id = db.Column(db.Integer, primary_key=True)
 
     uuid = db.Column(
-        db.String(36),
+        UUID_TYPE,
         unique=True,
         nullable=False,
         default=lambda: str(_uuid.uuid4()),
@@ -10,7 +10,7 @@ from werkzeug.security import check_password_hash, generate_password_hash
 
 from app.extensions import db
 
-from .mixins import SoftDeleteMixin, TimestampMixin
+from .mixins import UUID_TYPE, SoftDeleteMixin, TimestampMixin, soft_delete_indexes
 
 
 class User(db.Model, UserMixin, TimestampMixin, SoftDeleteMixin):
@@ -23,10 +23,11 @@ class User(db.Model, UserMixin, TimestampMixin, SoftDeleteMixin):
     """
 
     __tablename__ = "users"
+    __table_args__ = soft_delete_indexes("users")
     # ── Identity ────────────────────────────────────────────────
     id = db.Column(db.Integer, primary_key=True)
     uuid = db.Column(
-        db.String(36),
+        UUID_TYPE,
         unique=True,
         nullable=False,
         default=lambda: str(uuid.uuid4()),
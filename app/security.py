@@ -1,7 +1,20 @@
-# app/security.py  (new file)
+# app/security.py
+# Content-Security-Policy: per-request script nonce + the after_request header.
+from __future__ import annotations
+
 import secrets
 
-from flask import current_app, g, request
+from flask import current_app, g
+
+
+def new_nonce() -> str:
+    # 128-bit urlsafe token is plenty
+    return secrets.token_urlsafe(16)
+
+
+def nonce() -> str:
+    # The per-request nonce, if a template asked for one via csp_nonce()
+    return getattr(g, "csp_nonce", "")
 
 
 def attach_csp(app):
@@ -11,30 +24,34 @@ def attach_csp(app):
         def _csp_nonce():
             # generate once per request
             if not getattr(g, "csp_nonce", None):
-                g.csp_nonce = secrets.token_urlsafe(16)
+                g.csp_nonce = new_nonce()
             return g.csp_nonce
 
         return dict(csp_nonce=_csp_nonce)
 
+    # Everything except the nonce is fixed per app: build it once here,
+    # not inside the per-request hook.
+    script_src_base = " 'self' https://js.stripe.com"
+    csp_tail = (
+        "connect-src 'self' https://api.stripe.com https://hooks.stripe.com https://events.stripe.com; "
+        "img-src 'self' data: https:; "
+        "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
+        "font-src 'self' https://fonts.gstatic.com data:; "
+        "frame-src https://js.stripe.com https://checkout.stripe.com; "
+        "object-src 'none'; base-uri 'self'; form-action 'self' https://checkout.stripe.com;"
+    )
+
     @app.after_request
     def set_csp_header(response):
+        # Set header only in production
+        if current_app.debug:
+            return response
         # use the nonce generated for this request (if any)
-        nonce = getattr(g, "csp_nonce", "")
-        # build a strict CSP (example, tweak to your needs)
-        script_src = " 'self' https://js.stripe.com"
-        if nonce:
-            script_src += " 'nonce-{}'".format(nonce)
-        csp = (
-            "default-src 'self' https:; "
-            f"script-src {script_src}; "
-            "connect-src 'self' https://api.stripe.com https://hooks.stripe.com https://events.stripe.com; "
-            "img-src 'self' data: https:; "
-            "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
-            "font-src 'self' https://fonts.gstatic.com data:; "
-            "frame-src https://js.stripe.com https://checkout.stripe.com; "
-            "object-src 'none'; base-uri 'self'; form-action 'self' https://checkout.stripe.com;"
+        n = nonce()
+        script_src = script_src_base
+        if n:
+            script_src += " 'nonce-{}'".format(n)
+        response.headers["Content-Security-Policy"] = (
+            f"default-src 'self' https:; script-src {script_src}; {csp_tail}"
         )
-        # Set header only in production
-        if not current_app.debug:
-            response.headers["Content-Security-Policy"] = csp
         return response
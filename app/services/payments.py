@@ -1,11 +1,38 @@
 # app/services/payments.py
+import hashlib
 import os
-import random
+import secrets
 import time
+from functools import lru_cache
+from typing import NamedTuple
 
 import requests
 import stripe
-from flask import current_app
+from flask import current_app, g, has_request_context
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class PayPalSettings(NamedTuple):
+    base: str
+    env: str
+    client_id: str
+    secret: str
+    timeout: int
+
+
+@lru_cache(maxsize=8)
+def _paypal_session(base: str, client_id: str, secret: str) -> requests.Session:
+    """
+    Pooled keep-alive session per PayPal endpoint + credentials, so repeat
+    calls skip the TCP/TLS handshake. Retry only covers connect failures and
+    idempotent methods (urllib3 default), never a POST that reached PayPal.
+    """
+    session = requests.Session()
+    session.auth = (client_id, secret)
+    retry = Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504))
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=retry))
+    return session
 
 
 class PaymentService:
@@ -13,9 +40,26 @@ class PaymentService:
 
     @staticmethod
     def _demo_mode() -> bool:
-        return str(
-            os.getenv("DEMO_MODE", current_app.config.get("DEMO_MODE", "0"))
-        ).lower() in ("1", "true", "yes")
+        """DEMO_MODE is fixed at deploy time: resolve once per app."""
+        app = current_app._get_current_object()
+        demo = app.extensions.get("ff_demo_mode")
+        if demo is None:
+            demo = app.extensions["ff_demo_mode"] = str(
+                os.getenv("DEMO_MODE", app.config.get("DEMO_MODE", "0"))
+            ).lower() in ("1", "true", "yes")
+        return demo
+
+    @staticmethod
+    def _demo_now() -> float:
+        """Demo-mode clock: read once per request and shared via g."""
+        # Outside a request, g lives as long as the app context (CLI, workers),
+        # so caching there would freeze the clock.
+        if not has_request_context():
+            return time.time()
+        ts = g.get("_demo_ts")
+        if ts is None:
+            ts = g._demo_ts = time.time()
+        return ts
 
     # ---------------- STRIPE ----------------
     @staticmethod
@@ -27,8 +71,8 @@ class PaymentService:
         if PaymentService._demo_mode():
             # fake client_secret for demo
             return {
-                "id": f"pi_demo_{int(time.time())}",
-                "client_secret": f"demo_secret_{random.randint(1000,9999)}",
+                "id": f"pi_demo_{int(PaymentService._demo_now())}",
+                "client_secret": f"demo_secret_{secrets.randbelow(9000) + 1000}",
                 "amount": amount,
                 "currency": "usd",
                 "demo": True,
@@ -36,11 +80,18 @@ class PaymentService:
 
         # real call
         stripe.api_key = current_app.config.get("STRIPE_SECRET_KEY")
-        intent = stripe.PaymentIntent.create(
-            amount=int(amount * 100),
-            currency="usd",
-            payment_method_types=["card"],
-        )
+        params = {
+            "amount": int(amount * 100),
+            "currency": "usd",
+            "payment_method_types": ["card"],
+        }
+        # Client retries with the same key get Stripe's cached intent back
+        # instead of a second PaymentIntent.
+        idem = str(data.get("idempotency_key") or data.get("idempotencyKey") or "").strip()
+        if idem:
+            digest = hashlib.sha256(f"ff|svc|{idem}|amt:{params['amount']}".encode("utf-8")).hexdigest()[:48]
+            params["idempotency_key"] = f"ff_pi_{digest}"
+        intent = stripe.PaymentIntent.create(**params)
         return {"client_secret": intent.client_secret, "id": intent.id}
 
     # ---------------- PAYPAL ----------------
@@ -52,7 +103,7 @@ class PaymentService:
 
         if PaymentService._demo_mode():
             return {
-                "id": f"ORDER_DEMO_{int(time.time())}",
+                "id": f"ORDER_DEMO_{int(PaymentService._demo_now())}",
                 "status": "CREATED",
                 "amount": amount,
                 "currency": "USD",
@@ -60,19 +111,17 @@ class PaymentService:
             }
 
         # real request
-        url = f"{PaymentService._paypal_base()}/v2/checkout/orders"
-        client_id, secret = PaymentService._paypal_creds()
-        auth = (client_id, secret)
-        resp = requests.post(
+        cfg = PaymentService._paypal_settings()
+        url = f"{cfg.base}/v2/checkout/orders"
+        resp = PaymentService._paypal_http(cfg).post(
             url,
-            auth=auth,
             json={
                 "intent": "CAPTURE",
                 "purchase_units": [
                     {"amount": {"currency_code": "USD", "value": str(amount)}}
                 ],
             },
-            timeout=PaymentService._paypal_timeout(),
+            timeout=cfg.timeout,
         )
         resp.raise_for_status()
         data = resp.json()
@@ -90,16 +139,14 @@ class PaymentService:
                 "status": "COMPLETED",
                 "amount": 25.00,
                 "currency": "USD",
-                "captured_at": time.time(),
+                "captured_at": PaymentService._demo_now(),
                 "demo": True,
             }
 
         # real capture
-        url = f"{PaymentService._paypal_base()}/v2/checkout/orders/{order_id}/capture"
-        client_id, secret = PaymentService._paypal_creds()
-        resp = requests.post(
-            url, auth=(client_id, secret), timeout=PaymentService._paypal_timeout()
-        )
+        cfg = PaymentService._paypal_settings()
+        url = f"{cfg.base}/v2/checkout/orders/{order_id}/capture"
+        resp = PaymentService._paypal_http(cfg).post(url, timeout=cfg.timeout)
         resp.raise_for_status()
         data = resp.json()
         amt = None
@@ -117,24 +164,24 @@ class PaymentService:
 
     # ---------------- Helpers ----------------
     @staticmethod
-    def _paypal_base() -> str:
-        return (
-            "https://api-m.paypal.com"
-            if PaymentService._paypal_env() == "live"
-            else "https://api-m.sandbox.paypal.com"
-        )
-
-    @staticmethod
-    def _paypal_env() -> str:
-        return str(current_app.config.get("PAYPAL_ENV", "sandbox")).lower()
-
-    @staticmethod
-    def _paypal_creds() -> tuple[str, str]:
-        return (
-            str(current_app.config.get("PAYPAL_CLIENT_ID", "")),
-            str(current_app.config.get("PAYPAL_SECRET", "")),
-        )
+    def _paypal_settings() -> PayPalSettings:
+        """
+        PayPal env/creds/timeout resolved once per app and kept on
+        app.extensions (config does not change after startup).
+        """
+        app = current_app._get_current_object()
+        cfg = app.extensions.get("ff_paypal")
+        if cfg is None:
+            env = str(app.config.get("PAYPAL_ENV", "sandbox")).lower()
+            cfg = app.extensions["ff_paypal"] = PayPalSettings(
+                base="https://api-m.paypal.com" if env == "live" else "https://api-m.sandbox.paypal.com",
+                env=env,
+                client_id=str(app.config.get("PAYPAL_CLIENT_ID", "")),
+                secret=str(app.config.get("PAYPAL_SECRET", "")),
+                timeout=int(app.config.get("PAYPAL_TIMEOUT", 15)),
+            )
+        return cfg
 
     @staticmethod
-    def _paypal_timeout() -> int:
-        return int(current_app.config.get("PAYPAL_TIMEOUT", 15))
+    def _paypal_http(cfg: PayPalSettings) -> requests.Session:
+        return _paypal_session(cfg.base, cfg.client_id, cfg.secret)
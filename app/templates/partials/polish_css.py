@@ -1,68 +1,134 @@
 import glob
+import hashlib
+import json
+import os
 import re
 
+# Sidecar: css path -> [mtime_ns, size] as of our last pass over it.
+# Tool state, so it lives outside the served app/static tree.
+CACHE_PATH = ".cache/polish_css.json"
+
+# One rule block: "<selector> { <declarations> }". Innermost blocks only,
+# so rules nested in @media are still matched without re-scanning the file.
+BLOCK_RE = re.compile(r"([^{}]*)\{([^{}]*)\}")
+
+
+def patch_block(selector, body, patches):
+    for sel, edits in patches:
+        if not sel.search(selector):
+            continue
+        for decl, repl in edits:
+            if repl in body:
+                # Already applied (earlier run or edited file): appends and the
+                # multi-declaration replacements would otherwise stack up
+                continue
+            if decl is None:
+                # Append just before the closing brace
+                body += repl
+            else:
+                body = decl.sub(repl, body, count=1)
+    return body
+
 
 def patch_file(filepath, patches):
     with open(filepath) as f:
         css = f.read()
     orig = css
-    for find, repl in patches:
-        css = re.sub(find, repl, css, flags=re.MULTILINE)
+    css = BLOCK_RE.sub(lambda m: m.group(1) + "{" + patch_block(m.group(1), m.group(2), patches) + "}", css)
     if css != orig:
         print(f"Patched {filepath}")
         with open(filepath, "w") as f:
             f.write(css)
 
 
-# Patch list: (regex, replacement)
+def _stat_key(filepath):
+    st = os.stat(filepath)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_cache(version):
+    try:
+        with open(CACHE_PATH) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    # A different patch list invalidates every entry
+    return data.get("files", {}) if data.get("version") == version else {}
+
+
+def save_cache(version, files):
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    with open(CACHE_PATH, "w") as f:
+        json.dump({"version": version, "files": files}, f, indent=2)
+
+
+# Patch map: selector regex -> [(declaration regex | None to append, replacement)]
 patches = [
     # Hero wordmark opacity & z-index
-    (r"(\.fc-hero-wordmark[^{]*\{[^\}]*?)opacity:\s*[^;]+;", r"\1opacity: 0.05;"),
-    (r"(\.fc-hero-wordmark[^{]*\{[^\}]*?)z-index:\s*\d+;", r"\1z-index: 1;"),
-    # Feature tile background gradient
-    (
-        r"(\.feature-tile[^{]*\{[^\}]*?)background:\s*linear-gradient[^;]+;",
-        r"\1background: linear-gradient(160deg, #191929 85%, #232339 100%);",
-    ),
-    # Feature tile box-shadow
     (
-        r"(\.feature-tile[^{]*\{[^\}]*?)box-shadow:[^;]+;",
-        r"\1box-shadow: 0 8px 32px #0007, 0 2px 8px #fff2 inset;",
+        r"\.fc-hero-wordmark",
+        [
+            (r"opacity:\s*[^;]+;", "opacity: 0.05;"),
+            (r"z-index:\s*\d+;", "z-index: 1;"),
+        ],
     ),
-    # Border for extra pop
     (
-        r"(\.feature-tile[^{]*\{[^\}]*?)(})",
-        r"\1border: 1.5px solid rgba(255,255,255,0.04);\2",
+        r"\.feature-tile",
+        [
+            # Feature tile background gradient
+            (r"background:\s*linear-gradient[^;]+;", "background: linear-gradient(160deg, #191929 85%, #232339 100%);"),
+            # Feature tile box-shadow
+            (r"box-shadow:[^;]+;", "box-shadow: 0 8px 32px #0007, 0 2px 8px #fff2 inset;"),
+            # Border for extra pop
+            (None, "border: 1.5px solid rgba(255,255,255,0.04);"),
+        ],
     ),
     # Badge margin
     (
-        r"(\.badge[^{]*\{[^\}]*?)margin-bottom:[^;]+;",
-        r"\1margin-bottom: 0.7em; margin-right:0.5rem; vertical-align: middle;",
+        r"\.badge",
+        [(r"margin-bottom:[^;]+;", "margin-bottom: 0.7em; margin-right:0.5rem; vertical-align: middle;")],
     ),
-    # Tile-title font size & shadow
-    (r"(\.tile-title[^{]*\{[^\}]*?)font-size:[^;]+;", r"\1font-size: 1.36rem;"),
     (
-        r"(\.tile-title[^{]*\{[^\}]*?)text-shadow:[^;]+;",
-        r"\1text-shadow: 0 2px 8px #0005;",
+        r"\.tile-title",
+        [
+            # Tile-title font size & shadow
+            (r"font-size:[^;]+;", "font-size: 1.36rem;"),
+            (r"text-shadow:[^;]+;", "text-shadow: 0 2px 8px #0005;"),
+            # Tile-title margin top
+            (None, "margin-top: 0.3em;"),
+        ],
     ),
-    # Tile-title margin top
-    (r"(\.tile-title[^{]*\{[^\}]*?)(})", r"\1margin-top: 0.3em;\2"),
     # Hero photo z-index
-    (r"(\.fc-hero-photo[^{]*\{[^\}]*?)z-index:[^;]+;", r"\1z-index: 2;"),
+    (r"\.fc-hero-photo", [(r"z-index:[^;]+;", "z-index: 2;")]),
     # Gold CTA button shadow polish
     (
-        r"(\.fc-hero-cta\s*\.btn\.gold[^{]*\{[^\}]*?)box-shadow:[^;]+;",
-        r"\1box-shadow: 0 0 0 0 #facc1550, 0 0 14px 3px #facc1580;",
+        r"\.fc-hero-cta\s*\.btn\.gold",
+        [(r"box-shadow:[^;]+;", "box-shadow: 0 0 0 0 #facc1550, 0 0 14px 3px #facc1580;")],
     ),
     # Footer donate vertical-align
     (
-        r"(\.footer-donate[^{]*\{[^\}]*?)vertical-align:[^;]+;",
-        r"\1vertical-align: middle; margin-top: 1px;",
+        r"\.footer-donate",
+        [(r"vertical-align:[^;]+;", "vertical-align: middle; margin-top: 1px;")],
     ),
 ]
 
-# Patch all css files in static/css/
-for cssfile in glob.glob("app/static/css/*.css"):
-    patch_file(cssfile, patches)
+# Compile once; reused for every css file below
+COMPILED_PATCHES = [
+    (re.compile(sel), [(re.compile(decl) if decl else None, repl) for decl, repl in edits])
+    for sel, edits in patches
+]
+
+PATCHES_VERSION = hashlib.blake2b(repr(patches).encode("utf-8"), digest_size=8).hexdigest()
+
+if __name__ == "__main__":
+    cache = load_cache(PATCHES_VERSION)
+    seen = {}
+    # Patch all css files in static/css/ (skip ones untouched since last run)
+    for cssfile in glob.glob("app/static/css/*.css"):
+        if cache.get(cssfile) != _stat_key(cssfile):
+            patch_file(cssfile, COMPILED_PATCHES)
+        seen[cssfile] = _stat_key(cssfile)
+    if seen:
+        save_cache(PATCHES_VERSION, seen)
 
-print("✨ All done! Refresh your browser for agency-level upgrades.")
+    print("✨ All done! Refresh your browser for agency-level upgrades.")
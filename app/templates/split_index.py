@@ -4,34 +4,53 @@ import re
 src = Path("index.html")
 text = src.read_text(encoding="utf-8")
 
+# One pass over every <head>/<body>/<script> open/close tag (case-insensitive,
+# no lowered copy of the document).
+TOK = re.compile(r"<(?:(head|body|script)\b[^>]*|/(head|body|script)\s*)>", re.IGNORECASE)
+
+head_end = body_start = body_end = -1
+scripts = []  # (start, end) spans of <script>...</script>
+script_start = -1
+for m in TOK.finditer(text):
+    closing = m.group(2) is not None
+    name = (m.group(2) or m.group(1)).lower()
+    if name == "script":
+        if not closing and script_start == -1:
+            script_start = m.start()
+        elif closing and script_start != -1:
+            scripts.append((script_start, m.end()))
+            script_start = -1
+    elif name == "head":
+        if closing and head_end == -1:
+            head_end = m.end()
+    elif not closing:
+        if body_start == -1:
+            body_start = m.start()
+    elif body_start != -1 and body_end == -1:
+        body_end = m.end()
+
 # 1) HEAD: <!doctype html> ... </head>
-head_end = text.lower().find("</head>")
 if head_end == -1:
     raise SystemExit("Could not find </head> in index.html")
-head_end += len("</head>")
 head = text[:head_end].rstrip() + "\n"
 
 # 2) BODY: <body ...> ... </body>  (we'll remove the LAST <script>...</script> from it)
-body_match = re.search(r"<body\b[^>]*>.*?</body\s*>", text, flags=re.IGNORECASE | re.DOTALL)
-if not body_match:
+if body_start == -1 or body_end == -1:
     raise SystemExit("Could not find <body>...</body> in index.html")
-body = body_match.group(0)
+body = text[body_start:body_end]
 
 # 3) SCRIPT: choose the LAST <script>...</script> in the entire document (to avoid Stripe.js in <head>)
-scripts = list(re.finditer(r"<script\b[^>]*>.*?</script\s*>", text, flags=re.IGNORECASE | re.DOTALL))
 if not scripts:
     raise SystemExit("Could not find any <script>...</script> blocks in index.html")
-last_script = scripts[-1].group(0)
-
-# Remove the last script from inside the body (if it exists there)
-pos = body.rfind(last_script)
-if pos == -1:
-    # Fallback: remove the last <script>...</script> that appears inside <body> by matching from the right
-    inner_scripts = list(re.finditer(r"<script\b[^>]*>.*?</script\s*>", body, flags=re.IGNORECASE | re.DOTALL))
-    if not inner_scripts:
-        raise SystemExit("Could not find a <script>...</script> block inside <body>.")
-    last_script = inner_scripts[-1].group(0)
-    pos = body.rfind(last_script)
+
+# Remove the last script inside <body> (the document's last script whenever
+# that one is in the body; otherwise the last one the body contains)
+inner_scripts = [(s, e) for s, e in scripts if s >= body_start and e <= body_end]
+if not inner_scripts:
+    raise SystemExit("Could not find a <script>...</script> block inside <body>.")
+s_start, s_end = inner_scripts[-1]
+last_script = text[s_start:s_end]
+pos = s_start - body_start
 
 body_no_script = (
     body[:pos].rstrip()
@@ -40,7 +59,7 @@ body_no_script = (
 )
 
 # Add any trailing content after </body> (like </html>) into the body chunk so the recombined paste is complete
-tail = text[body_match.end():].strip()
+tail = text[body_end:].strip()
 if tail:
     body_no_script = body_no_script.rstrip() + "\n" + tail + "\n"
 
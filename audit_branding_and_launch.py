@@ -16,29 +16,39 @@ CHECKLIST = """
 LOGO_VARS = ['_org_logo', '_ff_logo', 'org_logo', 'ff_logo']
 BRAND_KEYWORDS = ['FutureFunded', 'futurefunded', 'Connect ATX Elite']
 
+# Compiled once: one alternation per check instead of a re.search per variable
+LOGO_RE = re.compile('|'.join(r'src="\{\{\s*' + v + r'\s*\|?[^}]*\}\}"' for v in LOGO_VARS))
+BRAND_RE = re.compile('|'.join(map(re.escape, BRAND_KEYWORDS)))
+
 def find_template_files(root='templates'):
-    for dirpath, dirs, files in os.walk(root):
-        for fname in files:
-            if fname.endswith('.html'):
-                yield os.path.join(dirpath, fname)
+    # os.scandir reuses each DirEntry's cached type instead of a stat per entry
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            # like os.walk: unreadable/missing dirs are skipped silently
+            continue
+        with it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+                elif e.name.endswith('.html'):
+                    yield e.path
 
-def audit_branding(template_path):
-    with open(template_path, encoding='utf-8') as f:
-        content = f.read()
-    results = {'missing_logo': False, 'missing_brand': False}
-    # Look for logo variables in <img> tags
-    has_logo = any(re.search(r'src="\{\{\s*' + v + r'\s*\|?[^}]*\}\}"', content) for v in LOGO_VARS)
-    # Look for branding keyword
-    has_brand = any(b in content for b in BRAND_KEYWORDS)
-    if not has_logo:
-        results['missing_logo'] = True
-    if not has_brand:
-        results['missing_brand'] = True
-    return results
+def audit_branding(template_path, content=None):
+    if content is None:
+        with open(template_path, encoding='utf-8') as f:
+            content = f.read()
+    # One pass per alternation over the whole text: a logo src="{{ ... }}" may span lines
+    has_logo = LOGO_RE.search(content) is not None
+    has_brand = BRAND_RE.search(content) is not None
+    return {'missing_logo': not has_logo, 'missing_brand': not has_brand}
 
-def insert_checklist_comment(template_path):
-    with open(template_path, encoding='utf-8') as f:
-        content = f.read()
+def insert_checklist_comment(template_path, content=None):
+    if content is None:
+        with open(template_path, encoding='utf-8') as f:
+            content = f.read()
     if CHECKLIST.strip() not in content:
         # Add at the very top
         with open(template_path, 'w', encoding='utf-8') as f:
@@ -47,9 +57,12 @@ def insert_checklist_comment(template_path):
 def main(root='templates', insert_checklist=True):
     summary = []
     for tfile in find_template_files(root):
-        audit = audit_branding(tfile)
+        # One read serves both the audit and the checklist insert
+        with open(tfile, encoding='utf-8') as f:
+            content = f.read()
+        audit = audit_branding(tfile, content)
         if insert_checklist:
-            insert_checklist_comment(tfile)
+            insert_checklist_comment(tfile, content)
         if audit['missing_logo'] or audit['missing_brand']:
             summary.append((tfile, audit))
     # Print a quick summary
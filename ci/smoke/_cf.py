@@ -0,0 +1,29 @@
+"""
+Cloudflare tunnel detection shared by the ci/smoke scripts.
+
+A trycloudflare / named tunnel that is not routed yet answers with a Cloudflare
+error page (530 / "Error 1033") instead of reaching Flask. Both smoketests use
+this to tell "tunnel not ready" apart from a broken route.
+"""
+
+from __future__ import annotations
+
+import requests
+
+_CF_NEEDLES = (b"cloudflare tunnel error", b"error 1033", b"argo tunnel")
+_CF_STATUSES = frozenset({530, 1033})
+
+
+def served_by_cloudflare(resp: requests.Response) -> bool:
+    return "cloudflare" in (resp.headers.get("server") or "").lower()
+
+
+def cf_tunnel_error(resp: requests.Response) -> bool:
+    # Heuristic: error pages have server=cloudflare and no app headers
+    if not served_by_cloudflare(resp):
+        return False
+    if resp.status_code in _CF_STATUSES:
+        return True
+    # Single lowered 4KB bytes slice; never decodes resp.text
+    lowered = (resp.content or b"")[:4096].lower()
+    return any(n in lowered for n in _CF_NEEDLES)
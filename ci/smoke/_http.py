@@ -0,0 +1,120 @@
+"""
+Shared HTTP plumbing for the ci/smoke scripts.
+
+One pooled, retrying requests.Session recipe so every smoke script gets the
+same keep-alive + backoff behaviour, plus the small helpers the smoketests
+share (check labels, pre-serialized JSON bodies, pool warmup). Scripts run as `python ci/smoke/<name>.py`,
+so this module is importable as `_http` from the script directory.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures as cf
+import json
+import socket
+from typing import Any, Iterable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504, 521, 522)
+RETRY_METHODS = ("GET", "POST", "HEAD")
+# Servers that do not implement HEAD for a route; only these justify a GET retry
+HEAD_UNSUPPORTED = frozenset({405, 501})
+
+# urllib3's defaults already include TCP_NODELAY; add SO_KEEPALIVE so pooled
+# connections survive idle gaps between the warmup and the check fan-out.
+SOCKET_OPTIONS = [*HTTPConnection.default_socket_options, (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("socket_options", SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+
+def make_session(
+    retries: int,
+    timeout: float,
+    pool_size: int = 60,
+    *,
+    user_agent: str,
+    status_forcelist: Iterable[int] = RETRY_STATUSES,
+    allowed_methods: Iterable[str] = RETRY_METHODS,
+) -> requests.Session:
+    sess = requests.Session()
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        backoff_factor=0.4,
+        status_forcelist=list(status_forcelist),
+        allowed_methods=list(allowed_methods),
+        raise_on_status=False,
+    )
+    adapter = KeepAliveAdapter(max_retries=retry, pool_connections=20, pool_maxsize=pool_size)
+    sess.mount("http://", adapter)
+    sess.mount("https://", adapter)
+    sess.headers.update({"User-Agent": user_agent})
+    sess.request_timeout = timeout  # type: ignore[attr-defined]
+    return sess
+
+
+def diagnostic_get(sess: requests.Session, url: str, headers: dict) -> requests.Response | None:
+    """
+    One plain GET (no urllib3 retries) after a failed HEAD probe, only to read the
+    real page body for failure details and Cloudflare error-page sniffing. The
+    check's status and timing stay the HEAD's.
+    """
+    try:
+        return requests.get(
+            url,
+            headers={**sess.headers, **headers},
+            timeout=sess.request_timeout,  # type: ignore[attr-defined]
+            allow_redirects=False,
+        )
+    except requests.RequestException:
+        return None
+
+
+class LabeledCheck:
+    """
+    Base for the slotted, frozen Check dataclasses: fills their `label` field.
+
+    Fixed per check, so "METHOD path →" is padded once instead of on every
+    report line.
+    """
+
+    __slots__ = ()
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "label", f"{self.method:<4} {self.path:<35} →")  # type: ignore[attr-defined]
+
+
+def json_body(payload: dict) -> bytes:
+    # Serialized once at import; run_check sends these bytes as-is
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def fmt(dt: float) -> str:
+    # dt in seconds (perf_counter delta)
+    return f"{dt * 1000.0:.0f}ms" if dt < 1.0 else f"{dt:.2f}s"
+
+
+def warm_pool(sess: requests.Session, base: str, n: int) -> None:
+    """
+    Open up to n keep-alive connections (one concurrent HEAD /healthz each)
+    so the check fan-out reuses them instead of paying TCP+TLS per worker.
+    """
+    url = base.rstrip("/") + "/healthz"
+
+    def _head(_: int) -> None:
+        try:
+            sess.head(url, timeout=sess.request_timeout, allow_redirects=False)  # type: ignore[attr-defined]
+        except Exception:
+            pass  # warmup only; the real checks report failures
+
+    with cf.ThreadPoolExecutor(max_workers=n) as ex:
+        list(ex.map(_head, range(n)))
@@ -5,9 +5,9 @@ import argparse
 import os
 import re
 import sys
-from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import requests
 
@@ -47,10 +47,10 @@ def normalize_base(base: str) -> str:
     return base.rstrip("/")
 
 
-def fetch_html(base: str, path: str, timeout: float) -> str:
+def fetch_html(base: str, path: str, timeout: float, session: Optional[requests.Session] = None) -> str:
     url = f"{base}{path}"
     try:
-        r = requests.get(url, timeout=timeout)
+        r = (session or requests).get(url, timeout=timeout)
     except requests.RequestException as ex:
         fail(f"{path} → request error: {ex}")
 
@@ -71,9 +71,16 @@ def looks_like_full_document(html: str) -> bool:
 
 
 def find_duplicate_ids(html: str) -> Dict[str, int]:
-    ids = ID_ATTR_RE.findall(html)
-    counts = Counter(ids)
-    return {k: v for k, v in counts.items() if v > 1}
+    # Stream matches; only ids seen twice get a count entry.
+    seen: set[str] = set()
+    dup: Dict[str, int] = {}
+    for m in ID_ATTR_RE.finditer(html):
+        v = m.group(1)
+        if v in seen:
+            dup[v] = dup.get(v, 1) + 1
+        else:
+            seen.add(v)
+    return dup
 
 
 def lint_dom(path: str, html: str, strict: bool) -> LintResult:
@@ -148,8 +155,11 @@ def main(argv: List[str]) -> int:
     results: List[LintResult] = []
     any_bad = False
 
-    for path in paths:
-        html = fetch_html(base, path, args.timeout)
+    # Fetch concurrently (network-bound); lint sequentially in path order.
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=min(8, len(paths))) as ex:
+        htmls = list(ex.map(lambda p: fetch_html(base, p, args.timeout, session), paths))
+
+    for path, html in zip(paths, htmls):
         res = lint_dom(path, html, strict=args.strict)
         results.append(res)
 
@@ -19,13 +19,14 @@ import os
 import socket
 import sys
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Literal
 from urllib.parse import urlparse
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+from _cf import cf_tunnel_error
+from _http import HEAD_UNSUPPORTED, LabeledCheck, diagnostic_get, fmt, json_body, make_session, warm_pool
 
 OK_CODES = {200, 201, 202, 204, 301, 302, 307, 308}
 
@@ -40,8 +41,8 @@ Kind = Literal["page", "json", "form"]
 Group = Literal["core", "public", "embeds", "api", "payments", "sms"]
 
 
-@dataclass(frozen=True)
-class Check:
+@dataclass(frozen=True, slots=True)
+class Check(LabeledCheck):
     method: Method
     path: str
     kind: Kind = "page"
@@ -49,87 +50,64 @@ class Check:
     group: Group = "core"
     data: dict | None = None
     headers: dict | None = None
-
-
-def checks() -> list[Check]:
-    return [
-        # core
-        Check("GET", "/", "page", True, "core"),
-        Check("GET", "/healthz", "json", True, "core"),
-        Check("GET", "/version", "page", True, "core"),
-        Check("GET", "/stats", "json", True, "core"),
-        Check("GET", "/donate", "page", True, "core"),
-        Check("GET", "/donate?prefill_name=Test&prefill_amount=25", "page", True, "core"),
-        Check("GET", "/admin", "page", True, "core"),
-
-        # public (optional)
-        Check("GET", "/tiers", "page", False, "public"),
-        Check("GET", "/sponsors", "page", False, "public"),
-        Check("GET", "/about", "page", False, "public"),
-        Check("GET", "/calendar", "page", False, "public"),
-        Check("GET", "/player-handbook", "page", False, "public"),
-        Check("GET", "/contact", "page", False, "public"),
-        Check("GET", "/thank-you?org=default&amount=50", "page", False, "public"),
-
-        # embeds (optional)
-        Check("GET", "/embed/about", "page", False, "embeds"),
-        Check("GET", "/embed/impact", "page", False, "embeds"),
-        Check("GET", "/tiers?mode=inline", "page", False, "embeds"),
-
-        # api
-        Check("GET", "/api/status", "json", True, "api"),
-        Check("GET", "/api/stats", "json", True, "api"),
-        Check("GET", "/api/donors", "json", True, "api"),
-        Check("GET", "/api/totals", "json", False, "api"),
-
-        # payments
-        Check("GET", "/payments/health", "json", True, "payments"),
-        Check(
-            "POST",
-            "/payments/stripe/intent",
-            "json",
-            True,
-            "payments",
-            data={"amount": 5000, "currency": "usd", "method": "stripe"},
-            headers={"Content-Type": "application/json"},
-        ),
-
-        # sms
-        Check("GET", "/sms/health", "json", True, "sms"),
-        Check(
-            "POST",
-            "/sms/webhook",
-            "form",
-            True,
-            "sms",
-            data={"Body": "Donate", "From": "+15551112222", "To": "+15553334444"},
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-        ),
-    ]
-
-
-def make_session(retries: int, timeout: float) -> requests.Session:
-    sess = requests.Session()
-    retry = Retry(
-        total=retries,
-        connect=retries,
-        read=retries,
-        backoff_factor=0.4,
-        status_forcelist=[429, 500, 502, 503, 504, 521, 522],
-        allowed_methods=["GET", "POST", "HEAD"],
-        raise_on_status=False,
-    )
-    adapter = HTTPAdapter(max_retries=retry, pool_connections=20, pool_maxsize=60)
-    sess.mount("http://", adapter)
-    sess.mount("https://", adapter)
-    sess.headers.update({"User-Agent": "FutureFundedSmoke+/2025"})
-    sess._timeout = timeout  # type: ignore[attr-defined]
-    return sess
-
-
-def fmt(dt: float) -> str:
-    ms = dt * 1000
-    return f"{ms:.0f}ms" if ms < 1000 else f"{ms/1000:.2f}s"
+    raw_body: bytes | None = None  # pre-serialized JSON body (POST json checks)
+    label: str = field(init=False, repr=False, compare=False)  # set by LabeledCheck
+
+
+CHECKS: tuple[Check, ...] = (
+    # core
+    Check("GET", "/", "page", True, "core"),
+    Check("GET", "/healthz", "json", True, "core"),
+    Check("GET", "/version", "page", True, "core"),
+    Check("GET", "/stats", "json", True, "core"),
+    Check("GET", "/donate", "page", True, "core"),
+    Check("GET", "/donate?prefill_name=Test&prefill_amount=25", "page", True, "core"),
+    Check("GET", "/admin", "page", True, "core"),
+
+    # public (optional)
+    Check("GET", "/tiers", "page", False, "public"),
+    Check("GET", "/sponsors", "page", False, "public"),
+    Check("GET", "/about", "page", False, "public"),
+    Check("GET", "/calendar", "page", False, "public"),
+    Check("GET", "/player-handbook", "page", False, "public"),
+    Check("GET", "/contact", "page", False, "public"),
+    Check("GET", "/thank-you?org=default&amount=50", "page", False, "public"),
+
+    # embeds (optional)
+    Check("GET", "/embed/about", "page", False, "embeds"),
+    Check("GET", "/embed/impact", "page", False, "embeds"),
+    Check("GET", "/tiers?mode=inline", "page", False, "embeds"),
+
+    # api
+    Check("GET", "/api/status", "json", True, "api"),
+    Check("GET", "/api/stats", "json", True, "api"),
+    Check("GET", "/api/donors", "json", True, "api"),
+    Check("GET", "/api/totals", "json", False, "api"),
+
+    # payments
+    Check("GET", "/payments/health", "json", True, "payments"),
+    Check(
+        "POST",
+        "/payments/stripe/intent",
+        "json",
+        True,
+        "payments",
+        raw_body=json_body({"amount": 5000, "currency": "usd", "method": "stripe"}),
+        headers={"Content-Type": "application/json"},
+    ),
+
+    # sms
+    Check("GET", "/sms/health", "json", True, "sms"),
+    Check(
+        "POST",
+        "/sms/webhook",
+        "form",
+        True,
+        "sms",
+        data={"Body": "Donate", "From": "+15551112222", "To": "+15553334444"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    ),
+)
 
 
 def dns_ok(host: str) -> bool:
@@ -140,61 +118,71 @@ def dns_ok(host: str) -> bool:
         return False
 
 
-def is_cloudflare_tunnel_error(resp: requests.Response) -> bool:
-    # Heuristic: error pages often have server=cloudflare and empty/no app headers
-    server = (resp.headers.get("server") or "").lower()
-    if "cloudflare" not in server:
-        return False
-    body = (resp.text or "")[:4000]
-    return (
-        "cloudflare tunnel error" in body.lower()
-        or "error 1033" in body.lower()
-        or "argo tunnel" in body.lower()
-        or resp.status_code in {530, 1033}
-    )
-
-
 def wait_for_healthz(sess: requests.Session, base: str, seconds: float) -> None:
     url = base.rstrip("/") + "/healthz"
-    deadline = time.time() + seconds
-    while time.time() < deadline:
+    # Short per-probe timeout so one hung connect can't eat the whole wait budget
+    probe_timeout = min(2.0, sess.request_timeout)  # type: ignore[attr-defined]
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
         try:
-            r = sess.get(url, timeout=sess._timeout)  # type: ignore[attr-defined]
+            r = sess.get(url, timeout=probe_timeout)
             if r.status_code == 200:
                 return
-            # If we're seeing CF tunnel errors, keep waiting (routing/connector not ready)
-            if is_cloudflare_tunnel_error(r) or r.status_code in {404, 530}:
-                time.sleep(0.5)
-                continue
+            # CF tunnel errors (routing/connector not ready) and other non-200s: keep waiting
         except Exception:
-            time.sleep(0.5)
+            pass
+        time.sleep(0.5)
     # not fatal by itself; checks will report failures
     print(f"{YELLOW}⚠ /healthz not reachable yet via {base}{RESET}")
 
 
 def run_check(sess: requests.Session, base: str, check: Check, auth_header: dict):
+    """Run one check; returns (check, status, details, line) and never prints (main is the single writer)."""
     url = base.rstrip("/") + (check.path if check.path.startswith("/") else "/" + check.path)
     headers = {**auth_header, **(check.headers or {})}
 
     body_kwargs = {}
-    if check.method == "POST":
+    if check.raw_body is not None:
+        body_kwargs["data"] = check.raw_body
+    elif check.method == "POST":
         if check.kind == "json":
             body_kwargs["json"] = check.data or {}
         else:
             body_kwargs["data"] = check.data or {}
 
+    # Page checks only look at the status code: probe with HEAD so no body is transferred
+    method = "HEAD" if (check.kind == "page" and check.method == "GET") else check.method
+
     try:
         t0 = time.perf_counter()
         r = sess.request(
-            check.method,
+            method,
             url,
-            timeout=sess._timeout,  # type: ignore[attr-defined]
+            timeout=sess.request_timeout,  # type: ignore[attr-defined]
             allow_redirects=False,
             headers=headers,
             **body_kwargs,
         )
+        if method != check.method and r.status_code in HEAD_UNSUPPORTED:
+            # Route rejects HEAD itself: repeat as GET through the session
+            r = sess.request(
+                check.method,
+                url,
+                timeout=sess.request_timeout,  # type: ignore[attr-defined]
+                allow_redirects=False,
+                headers=headers,
+            )
         dt = time.perf_counter() - t0
 
+        # Any other failed HEAD has no body: fetch the page once, without the retry
+        # cycle, so details and tunnel sniffing still see the real error page
+        body_r = r
+        if r.request.method == "HEAD" and r.status_code not in OK_CODES:
+            # (not `or r`: a Response is falsy for 4xx/5xx)
+            fetched = diagnostic_get(sess, url, headers)
+            if fetched is not None:
+                body_r = fetched
+
         ok = r.status_code in OK_CODES
         status = "OK" if ok else ("WARN" if not check.required else "FAIL")
 
@@ -205,25 +193,24 @@ def run_check(sess: requests.Session, base: str, check: Check, auth_header: dict
             if "json" not in ct:
                 warns.append("content-type")
             try:
-                r.json()
+                json.loads(r.content)
             except Exception:
                 warns.append("invalid-json")
 
         color = GREEN if status == "OK" else (YELLOW if status == "WARN" else RED)
         warn_txt = f" {YELLOW}(warn: {','.join(warns)}){RESET}" if warns else ""
-        print(f"{color}{check.method:<4} {check.path:<35} → {r.status_code:>3} {DIM}{fmt(dt)}{RESET}{warn_txt}")
+        line = f"{color}{check.label} {r.status_code:>3} {DIM}{fmt(dt)}{RESET}{warn_txt}\n"
 
         # If we got a CF tunnel error page, attach a hint
-        if not ok and is_cloudflare_tunnel_error(r):
-            print(f"{YELLOW}{DIM}      hint: looks like a Cloudflare tunnel/routing error (not your Flask route){RESET}")
+        if not ok and cf_tunnel_error(body_r):
+            line += f"{YELLOW}{DIM}      hint: looks like a Cloudflare tunnel/routing error (not your Flask route){RESET}\n"
 
-        return check, status, (r.text or "")[:250]
+        return check, status, (body_r.content or b"")[:250].decode("utf-8", "replace"), line
 
     except Exception as e:
         status = "WARN" if not check.required else "FAIL"
         color = YELLOW if status == "WARN" else RED
-        print(f"{color}{check.method:<4} {check.path:<35} → ERR {e}{RESET}")
-        return check, status, str(e)
+        return check, status, str(e), f"{color}{check.label} ERR {e}{RESET}\n"
 
 
 def main() -> None:
@@ -248,15 +235,22 @@ def main() -> None:
     if parsed.hostname and not dns_ok(parsed.hostname):
         print(f"{YELLOW}⚠ DNS lookup failed for {parsed.hostname}. (Tunnel URL expired or not propagated yet?){RESET}")
 
-    sess = make_session(args.retries, args.timeout)
+    sess = make_session(
+        args.retries,
+        args.timeout,
+        pool_size=max(60, args.concurrency * 2),
+        user_agent="FutureFundedSmoke+/2025",
+    )
 
     # Warmup helps a lot for trycloudflare.com
     if args.wait > 0 and parsed.scheme == "https":
         wait_for_healthz(sess, base, args.wait)
+    if parsed.scheme == "https":
+        warm_pool(sess, base, args.concurrency)
 
     auth_header = {"Authorization": f"Bearer {args.token}"} if args.token else {}
 
-    selected = checks()
+    selected = list(CHECKS)
 
     if args.groups:
         wanted = {g.strip() for g in args.groups.split(",") if g.strip()}
@@ -266,22 +260,24 @@ def main() -> None:
         wanted = {p.strip() for p in args.only.split(",") if p.strip()}
         selected = [c for c in selected if c.path in wanted]
 
-    results = []
     with cf.ThreadPoolExecutor(max_workers=args.concurrency) as ex:
         futs = [ex.submit(run_check, sess, base, c, auth_header) for c in selected]
-        for f in cf.as_completed(futs):
-            results.append(f.result())
+        results = [f.result() for f in futs]
+
+    # Single writer: one stdout write, in check order
+    sys.stdout.write("".join(line for *_, line in results))
+    sys.stdout.flush()
 
-    passed = sum(1 for _, s, _ in results if s == "OK")
-    warns = sum(1 for _, s, _ in results if s == "WARN")
-    fails = sum(1 for _, s, _ in results if s == "FAIL")
+    passed = sum(1 for _, s, _, _ in results if s == "OK")
+    warns = sum(1 for _, s, _, _ in results if s == "WARN")
+    fails = sum(1 for _, s, _, _ in results if s == "FAIL")
 
     print("\n────────────────────────────────────────────")
     print(f"{GREEN}OK={passed}{RESET}  {YELLOW}WARN={warns}{RESET}  {RED}FAIL={fails}{RESET}")
 
     if fails or (args.strict and warns):
         print(f"{RED}❌ Smoke+ FAILED{RESET}")
-        for c, s, _ in results:
+        for c, s, _, _ in results:
             if s == "FAIL" or (args.strict and s == "WARN"):
                 print(f"- [{c.group}] {c.method} {c.path} → {s}")
         sys.exit(1)
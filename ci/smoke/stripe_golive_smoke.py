@@ -13,13 +13,14 @@ Checks:
 from __future__ import annotations
 
 import argparse
+import concurrent.futures as cf
 import json
 import os
 import sys
 from pathlib import Path
 from typing import Any, Dict, Iterable, Tuple
 
-import requests
+from _http import make_session
 
 
 DEFAULT_PATHS = ["/", "/payments/health", "/payments/config"]
@@ -62,7 +63,14 @@ class Client:
     def __init__(self, base: str, bearer: str | None, timeout: float = 12.0):
         self.base = base.rstrip("/")
         self.timeout = timeout
-        self.session = requests.Session()
+        # Pooled keep-alive + backoff; POST is never retried (it creates a live PaymentIntent)
+        self.session = make_session(
+            retries=2,
+            timeout=timeout,
+            pool_size=8,
+            user_agent="FutureFundedGoLiveSmoke/1.0",
+            allowed_methods=("GET", "HEAD"),
+        )
         self.headers = {"accept": "application/json"}
         if bearer:
             self.headers["Authorization"] = f"Bearer {bearer}"
@@ -113,8 +121,12 @@ def require_mode(sk: str, pk: str, expect: str) -> None:
 
 
 def check_gets(http: Client, paths: Iterable[str]) -> None:
-    for p in paths:
-        code, _ = http.get(p)
+    paths = list(paths)
+    # Fan out over the pooled session: one round trip for the batch, not one per path
+    with cf.ThreadPoolExecutor(max_workers=max(1, min(8, len(paths)))) as ex:
+        results = list(ex.map(http.get, paths))
+
+    for p, (code, _) in zip(paths, results):
         if code != 200:
             die(f"{p} expected 200, got {code}")
     ok("GET routes OK")
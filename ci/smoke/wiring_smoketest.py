@@ -18,13 +18,14 @@ import os
 import socket
 import sys
 import time
-from dataclasses import dataclass
-from typing import Iterable, Literal
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Literal
 from urllib.parse import urlparse
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+from _cf import cf_tunnel_error, served_by_cloudflare
+from _http import HEAD_UNSUPPORTED, RETRY_STATUSES, LabeledCheck, diagnostic_get, fmt, json_body, make_session, warm_pool
 
 OK = {200, 201, 202, 204, 301, 302, 307, 308}
 
@@ -36,8 +37,8 @@ DIM = "\033[2m"
 RESET = "\033[0m"
 
 
-@dataclass(frozen=True)
-class Check:
+@dataclass(frozen=True, slots=True)
+class Check(LabeledCheck):
     method: Literal["GET", "POST", "HEAD"]
     path: str
     group: str
@@ -45,6 +46,8 @@ class Check:
     required: bool = True
     data: dict | None = None
     headers: dict | None = None
+    raw_body: bytes | None = None  # pre-serialized JSON body (POST json checks)
+    label: str = field(init=False, repr=False, compare=False)  # set by LabeledCheck
 
 
 def _force_ipv4() -> None:
@@ -54,29 +57,6 @@ def _force_ipv4() -> None:
     urllib3_cn.allowed_gai_family = lambda: socket.AF_INET  # type: ignore
 
 
-def make_session(retries: int, timeout: float) -> requests.Session:
-    sess = requests.Session()
-    retry = Retry(
-        total=retries,
-        connect=retries,
-        read=retries,
-        backoff_factor=0.4,
-        status_forcelist=[429, 500, 502, 503, 504, 521, 522, 530],
-        allowed_methods=["GET", "POST", "HEAD"],
-        raise_on_status=False,
-    )
-    adapter = HTTPAdapter(max_retries=retry, pool_connections=20, pool_maxsize=60)
-    sess.mount("http://", adapter)
-    sess.mount("https://", adapter)
-    sess.headers.update({"User-Agent": "FutureFundedSmoke+/PaymentsStrict"})
-    sess.request_timeout = timeout  # type: ignore[attr-defined]
-    return sess
-
-
-def fmt(ms: float) -> str:
-    return f"{ms:.0f}ms" if ms < 1000 else f"{ms/1000:.2f}s"
-
-
 def normalize_base(args_base: str | None) -> str:
     base = (args_base or "").strip() or os.getenv("BASE", "").strip() or os.getenv("PUBLIC_BASE_URL", "").strip()
     if not base:
@@ -103,20 +83,21 @@ def dns_preflight(base: str) -> tuple[bool, bool]:
 
 
 def wait_for_healthz(sess: requests.Session, base: str, seconds: float) -> None:
-    deadline = time.time() + seconds
+    # Short per-probe timeout so one hung connect can't eat the whole wait budget
+    probe_timeout = min(2.0, sess.request_timeout)
+    deadline = time.monotonic() + seconds
     last = ""
 
-    while time.time() < deadline:
+    while time.monotonic() < deadline:
         try:
-            r = sess.get(base + "/healthz", timeout=sess.request_timeout)
+            r = sess.get(base + "/healthz", timeout=probe_timeout)
             code = r.status_code
-            server = (r.headers.get("server") or "").lower()
 
             if code == 200:
                 return
 
             # Tunnel warmup patterns
-            if "cloudflare" in server and code in {404, 530}:
+            if cf_tunnel_error(r) or (code == 404 and served_by_cloudflare(r)):
                 last = f"cloudflare:{code}"
                 time.sleep(0.5)
                 continue
@@ -131,28 +112,15 @@ def wait_for_healthz(sess: requests.Session, base: str, seconds: float) -> None:
     print(f"{YELLOW}⚠ /healthz not ready after {seconds:.0f}s (last={last}){RESET}")
 
 
-def _looks_like_html(body: str) -> bool:
-    b = (body or "").lstrip().lower()
-    return b.startswith("<!doctype") or b.startswith("<html") or ("<body" in b[:500])
-
-
-def validate_stripe_intent_response(body: str) -> str | None:
-    """
-    Hard contract validation for POST /payments/stripe/intent
-    - Ensures cents contract
-    - Ensures Stripe test mode
-    - Ensures required keys + types
-    """
-    if _looks_like_html(body):
-        return "got HTML (likely server error page)"
+def _looks_like_html(body: bytes) -> bool:
+    # Only the head of the body matters: never lower/copy the full response
+    b = (body or b"")[:1024].lstrip().lower()
+    return b.startswith((b"<!doctype", b"<html")) or (b"<body" in b[:500])
 
-    try:
-        j = json.loads(body)
-    except Exception:
-        return "invalid JSON"
 
-    # Required response keys (matches your backend response)
-    required_keys = {
+# Required response keys (matches your backend response)
+INTENT_REQUIRED_KEYS = frozenset(
+    {
         "ok",
         "donation_id",
         "id",
@@ -164,8 +132,32 @@ def validate_stripe_intent_response(body: str) -> str | None:
         "fee_cents",
         "round_up_add_cents",
     }
+)
+INTENT_CENTS_KEYS = ("amount_cents", "fee_cents", "round_up_add_cents")
+
+
+def validate_stripe_intent_response(body: bytes, parsed: Any = None) -> str | None:
+    """
+    Hard contract validation for POST /payments/stripe/intent
+    - Ensures cents contract
+    - Ensures Stripe test mode
+    - Ensures required keys + types
+    Pass `parsed` when the caller already decoded the JSON body.
+    """
+    if parsed is None:
+        if _looks_like_html(body):
+            return "got HTML (likely server error page)"
+
+        try:
+            parsed = json.loads(body)
+        except Exception:
+            return "invalid JSON"
+
+    j = parsed
+    if not isinstance(j, dict):
+        return "response is not a JSON object"
 
-    missing = required_keys - set(j.keys())
+    missing = INTENT_REQUIRED_KEYS.difference(j)
     if missing:
         return f"missing keys: {sorted(missing)}"
 
@@ -192,7 +184,7 @@ def validate_stripe_intent_response(body: str) -> str | None:
         return f"Stripe mode is not test (got {mode})"
 
     # cents integrity
-    for k in ("amount_cents", "fee_cents", "round_up_add_cents"):
+    for k in INTENT_CENTS_KEYS:
         if not isinstance(j.get(k), int):
             return f"{k} not int"
         if j[k] < 0:
@@ -208,6 +200,7 @@ def validate_stripe_intent_response(body: str) -> str | None:
 
 
 def run_check(sess: requests.Session, base: str, check: Check, auth_header: dict, host_header: str | None):
+    """Run one check; returns (check, status, details, line) and never prints (main is the single writer)."""
     url = base + (check.path if check.path.startswith("/") else "/" + check.path)
 
     headers = {}
@@ -218,7 +211,9 @@ def run_check(sess: requests.Session, base: str, check: Check, auth_header: dict
         headers.update(check.headers)
 
     body_kwargs = {}
-    if check.method == "POST":
+    if check.raw_body is not None:
+        body_kwargs["data"] = check.raw_body
+    elif check.method == "POST":
         if check.kind == "json":
             body_kwargs["json"] = check.data or {}
         elif check.kind == "form":
@@ -226,117 +221,143 @@ def run_check(sess: requests.Session, base: str, check: Check, auth_header: dict
         else:
             body_kwargs["data"] = check.data or {}
 
+    # Page checks only look at the status code: probe with HEAD so no body is transferred
+    method = "HEAD" if (check.kind == "page" and check.method == "GET") else check.method
+
     try:
         t0 = time.perf_counter()
         r = sess.request(
-            check.method,
+            method,
             url,
             timeout=sess.request_timeout,
             allow_redirects=False,
             headers=headers,
             **body_kwargs,
         )
+        if method != check.method and r.status_code in HEAD_UNSUPPORTED:
+            # Route rejects HEAD itself: repeat as GET through the session
+            r = sess.request(
+                check.method,
+                url,
+                timeout=sess.request_timeout,
+                allow_redirects=False,
+                headers=headers,
+            )
         dt = time.perf_counter() - t0
 
+        # Any other failed HEAD has no body: fetch the page once, without the retry
+        # cycle, so details and tunnel sniffing still see the real error page
+        body_r = r
+        if r.request.method == "HEAD" and r.status_code not in OK:
+            # (not `or r`: a Response is falsy for 4xx/5xx)
+            fetched = diagnostic_get(sess, url, headers)
+            if fetched is not None:
+                body_r = fetched
+
         ok_basic = r.status_code in OK
-        msg = f"{check.method:<4} {check.path:<35} → {r.status_code:>3} {DIM}{fmt(dt)}{RESET}"
+        msg = f"{check.label} {r.status_code:>3} {DIM}{fmt(dt)}{RESET}"
 
         warn = ""
+        parsed = None
 
-        # JSON validation for json kind
+        # JSON validation for json kind (parsed once from raw bytes; reused below)
         if ok_basic and check.kind == "json":
             ct = (r.headers.get("content-type") or "").lower()
             if "json" not in ct:
                 warn = f"{YELLOW}(warn: content-type){RESET}"
             else:
                 try:
-                    json.loads(r.text or "{}")
+                    parsed = json.loads(r.content or b"{}")
                 except Exception:
                     warn = f"{YELLOW}(warn: invalid JSON){RESET}"
 
         # 🔒 Payments strict: Stripe intent schema validation
         if ok_basic and check.path == "/payments/stripe/intent":
-            err = validate_stripe_intent_response(r.text or "")
+            err = validate_stripe_intent_response(r.content or b"", parsed)
             if err:
-                print(f"{RED}{msg}{RESET} {RED}(stripe invalid: {err}){RESET}")
-                return check, "FAIL", err
+                return check, "FAIL", err, f"{RED}{msg}{RESET} {RED}(stripe invalid: {err}){RESET}\n"
 
         color = GREEN if ok_basic else (YELLOW if not check.required else RED)
-        print(f"{color}{msg}{RESET} {warn}")
-
         status = "OK" if ok_basic else ("WARN" if not check.required else "FAIL")
-        return check, status, (r.text or "")[:500]
+        line = f"{color}{msg}{RESET} {warn}\n"
+
+        # If we got a CF tunnel error page, attach a hint
+        if not ok_basic and cf_tunnel_error(body_r):
+            line += f"{YELLOW}{DIM}      hint: looks like a Cloudflare tunnel/routing error (not your Flask route){RESET}\n"
+
+        return check, status, (body_r.content or b"")[:500].decode("utf-8", "replace"), line
 
     except Exception as e:
         hint = ""
         if "Network is unreachable" in str(e):
             hint = " [hint: IPv6 route issue? try --ipv4]"
         color = YELLOW if not check.required else RED
-        print(f"{color}{check.method:<4} {check.path:<35} → ERR {e}{RESET}{hint}")
-        return check, ("WARN" if not check.required else "FAIL"), str(e)
-
-
-def build_checks() -> list[Check]:
-    return [
-        # CORE
-        Check("GET", "/", "core", "page", True),
-        Check("GET", "/healthz", "core", "json", True),
-        Check("GET", "/version", "core", "page", True),
-        Check("GET", "/stats", "core", "json", True),
-        Check("GET", "/donate", "core", "page", True),
-        Check("GET", "/donate?prefill_name=Test&prefill_amount=25", "core", "page", True),
-        Check("GET", "/admin", "core", "page", True),
-
-        # PUBLIC (optional)
-        Check("GET", "/tiers", "public", "page", False),
-        Check("GET", "/sponsors", "public", "page", False),
-        Check("GET", "/about", "public", "page", False),
-        Check("GET", "/calendar", "public", "page", False),
-        Check("GET", "/player-handbook", "public", "page", False),
-        Check("GET", "/contact", "public", "page", False),
-        Check("GET", "/thank-you?org=default&amount=50", "public", "page", False),
-
-        # EMBEDS (optional)
-        Check("GET", "/embed/about", "embeds", "page", False),
-        Check("GET", "/embed/impact", "embeds", "page", False),
-        Check("GET", "/tiers?mode=inline", "embeds", "page", False),
-
-        # API
-        Check("GET", "/api/status", "api", "json", True),
-        Check("GET", "/api/stats", "api", "json", True),
-        Check("GET", "/api/donors", "api", "json", True),
-        Check("GET", "/api/totals", "api", "json", False),
-
-        # PAYMENTS
-        Check("GET", "/payments/health", "payments", "json", True),
-        Check(
-            "POST",
-            "/payments/stripe/intent",
-            "payments",
-            "json",
-            True,
-            data={
+        line = f"{color}{check.label} ERR {e}{RESET}{hint}\n"
+        return check, ("WARN" if not check.required else "FAIL"), str(e), line
+
+
+CHECKS: tuple[Check, ...] = (
+    # CORE
+    Check("GET", "/", "core", "page", True),
+    Check("GET", "/healthz", "core", "json", True),
+    Check("GET", "/version", "core", "page", True),
+    Check("GET", "/stats", "core", "json", True),
+    Check("GET", "/donate", "core", "page", True),
+    Check("GET", "/donate?prefill_name=Test&prefill_amount=25", "core", "page", True),
+    Check("GET", "/admin", "core", "page", True),
+
+    # PUBLIC (optional)
+    Check("GET", "/tiers", "public", "page", False),
+    Check("GET", "/sponsors", "public", "page", False),
+    Check("GET", "/about", "public", "page", False),
+    Check("GET", "/calendar", "public", "page", False),
+    Check("GET", "/player-handbook", "public", "page", False),
+    Check("GET", "/contact", "public", "page", False),
+    Check("GET", "/thank-you?org=default&amount=50", "public", "page", False),
+
+    # EMBEDS (optional)
+    Check("GET", "/embed/about", "embeds", "page", False),
+    Check("GET", "/embed/impact", "embeds", "page", False),
+    Check("GET", "/tiers?mode=inline", "embeds", "page", False),
+
+    # API
+    Check("GET", "/api/status", "api", "json", True),
+    Check("GET", "/api/stats", "api", "json", True),
+    Check("GET", "/api/donors", "api", "json", True),
+    Check("GET", "/api/totals", "api", "json", False),
+
+    # PAYMENTS
+    Check("GET", "/payments/health", "payments", "json", True),
+    Check(
+        "POST",
+        "/payments/stripe/intent",
+        "payments",
+        "json",
+        True,
+        raw_body=json_body(
+            {
                 "amount_cents": 2500,  # $25.00 canonical
                 "currency": "usd",
                 "email": "smoke-test@futurefunded.dev",
                 "cover_fees": False,
                 "round_up": False,
-            },
-            headers={"Content-Type": "application/json"},
+            }
         ),
-
-        # SMS
-        Check("GET", "/sms/health", "sms", "json", True),
-        Check(
-            "POST",
-            "/sms/webhook",
-            "sms",
-            "form",
-            True,
-            data={"Body": "Donate", "From": "+15551112222", "To": "+15553334444"},
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-        ),
-    ]
+        headers={"Content-Type": "application/json"},
+    ),
+
+    # SMS
+    Check("GET", "/sms/health", "sms", "json", True),
+    Check(
+        "POST",
+        "/sms/webhook",
+        "sms",
+        "form",
+        True,
+        data={"Body": "Donate", "From": "+15551112222", "To": "+15553334444"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    ),
+)
 
 
 def main() -> None:
@@ -367,16 +388,23 @@ def main() -> None:
     elif args.ipv4 and base.startswith("https://") and not has_v4 and has_v6:
         print(f"{YELLOW}⚠ Host resolves IPv6-only; --ipv4 may fail unless an A record exists{RESET}")
 
-    sess = make_session(args.retries, args.timeout)
+    sess = make_session(
+        args.retries,
+        args.timeout,
+        pool_size=max(60, args.concurrency * 2),
+        user_agent="FutureFundedSmoke+/PaymentsStrict",
+        status_forcelist=(*RETRY_STATUSES, 530),
+    )
 
     if base.startswith("https://"):
         print(f"{DIM}…waiting for /healthz to become reachable (up to {args.wait_seconds:.0f}s){RESET}")
         wait_for_healthz(sess, base, args.wait_seconds)
+        warm_pool(sess, base, args.concurrency)
 
     auth_header = {"Authorization": f"Bearer {args.token}"} if args.token else {}
     host_header = args.host_header.strip() or None
 
-    checks = build_checks()
+    checks = list(CHECKS)
 
     if args.groups:
         wanted = {g.strip() for g in args.groups.split(",") if g.strip()}
@@ -386,22 +414,24 @@ def main() -> None:
         wanted_paths = {p.strip() for p in args.only.split(",") if p.strip()}
         checks = [c for c in checks if c.path in wanted_paths]
 
-    results = []
     with cf.ThreadPoolExecutor(max_workers=args.concurrency) as ex:
         futs = [ex.submit(run_check, sess, base, c, auth_header, host_header) for c in checks]
-        for f in cf.as_completed(futs):
-            results.append(f.result())
+        results = [f.result() for f in futs]
+
+    # Single writer: one stdout write, in check order
+    sys.stdout.write("".join(line for *_, line in results))
+    sys.stdout.flush()
 
-    passed = sum(1 for _, s, _ in results if s == "OK")
-    soft = sum(1 for _, s, _ in results if s == "WARN")
-    fails = sum(1 for _, s, _ in results if s == "FAIL")
+    passed = sum(1 for _, s, _, _ in results if s == "OK")
+    soft = sum(1 for _, s, _, _ in results if s == "WARN")
+    fails = sum(1 for _, s, _, _ in results if s == "FAIL")
 
     print("\n────────────────────────────────────────────")
     print(f"{GREEN}OK={passed}{RESET}  {YELLOW}WARN={soft}{RESET}  {RED}FAIL={fails}{RESET}")
 
     if fails or (args.strict and soft):
         print(f"{RED}❌ Smoke+ FAILED{RESET}")
-        for c, s, details in results:
+        for c, s, details, _ in results:
             if s == "FAIL" or (args.strict and s == "WARN"):
                 print(f"- {c.method} {c.path} → {s} ({details})")
         sys.exit(1)
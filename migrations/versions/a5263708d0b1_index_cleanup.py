@@ -0,0 +1,168 @@
+"""index cleanup
+
+Drops duplicate/shadowed single-column indexes, rebuilds the soft-delete
+indexes as partial indexes and adds the composite indexes the hot queries use.
+
+On Postgres every index is created/dropped CONCURRENTLY outside the migration
+transaction, so the populated tables keep taking writes. A failed concurrent
+build leaves an INVALID index behind: drop it and re-run the upgrade.
+
+Revision ID: a5263708d0b1
+Revises: 771c31231115
+Create Date: 2026-10-17 21:40:12.118304
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a5263708d0b1"
+down_revision = "771c31231115"
+branch_labels = None
+depends_on = None
+
+SOFT_DELETE_TABLES = (
+    "orgs",
+    "sms_logs",
+    "sponsor_clicks",
+    "teams",
+    "players",
+    "sponsors",
+    "users",
+    "donations",
+    "transactions",
+)
+# (column, predicate) for the partial soft-delete indexes: only trashed rows are indexed
+SOFT_DELETE_WHERE = (("deleted", "deleted"), ("deleted_at", "deleted_at IS NOT NULL"))
+
+
+# -----------------------------------------------------------------------------
+# Helpers
+# -----------------------------------------------------------------------------
+def _where(predicate):
+    # Partial index predicate (both Postgres and SQLite support WHERE on CREATE INDEX)
+    clause = sa.text(predicate)
+    return {"postgresql_where": clause, "sqlite_where": clause}
+
+def _ix(name, columns, **kw):
+    return name, columns, kw
+
+def _is_postgres():
+    return op.get_bind().dialect.name == "postgresql"
+
+def _changes():
+    """(table, indexes before, indexes after) in upgrade order; downgrade swaps the two."""
+    changes = [
+        # Active rows are the overwhelming majority, so a full index on deleted/deleted_at
+        # is huge and never selective; index only trashed rows (trash/purge lookups).
+        (
+            table,
+            [_ix(op.f(f"ix_{table}_{column}"), [column]) for column, _ in SOFT_DELETE_WHERE],
+            [_ix(op.f(f"ix_{table}_{column}"), [column], **_where(pred)) for column, pred in SOFT_DELETE_WHERE],
+        )
+        for table in SOFT_DELETE_TABLES
+    ]
+    changes += [
+        # duplicates of the generated indexes; tenant is the ix_clicks_tenant_surface prefix
+        (
+            "sponsor_clicks",
+            [
+                _ix("ix_clicks_created", ["created_at"]),
+                _ix("ix_clicks_name", ["name"]),
+                _ix(op.f("ix_sponsor_clicks_tenant"), ["tenant"]),
+            ],
+            [],
+        ),
+        # type is the ix_stripe_events_type_created prefix
+        ("stripe_events", [_ix(op.f("ix_stripe_events_type"), ["type"])], []),
+        # org-scoped leaderboard; its org_id prefix replaces both org_id indexes,
+        # and status is already the ix_sponsors_status_amount prefix
+        (
+            "sponsors",
+            [
+                _ix("ix_sponsors_org", ["org_id"]),
+                _ix(op.f("ix_sponsors_org_id"), ["org_id"]),
+                _ix(op.f("ix_sponsors_status"), ["status"]),
+            ],
+            [
+                _ix(
+                    "ix_sponsors_org_status_amount",
+                    ["org_id", "status", "amount"],
+                    postgresql_include=["name", "tier"],
+                ),
+            ],
+        ),
+        (
+            "donations",
+            [
+                _ix("ix_donations_goal", ["campaign_goal_id"]),
+                _ix("ix_donations_org", ["org_id"]),
+                _ix(op.f("ix_donations_campaign_goal_id"), ["campaign_goal_id"]),
+                _ix("ix_donations_team_status", ["team_id", "deleted_at"]),
+            ],
+            [
+                # covering: goal progress SUM(amount_cents) WHERE campaign_goal_id=? AND provider_status IN (...)
+                _ix(
+                    "ix_donations_goal_status",
+                    ["campaign_goal_id", "provider_status"],
+                    postgresql_include=["amount_cents"],
+                ),
+                # recent active donations per team; deleted_at is a predicate, not a key column
+                _ix("ix_donations_team_active", ["team_id", "created_at"], **_where("deleted_at IS NULL")),
+            ],
+        ),
+        # duplicates of the generated ix_transactions_* indexes
+        (
+            "transactions",
+            [
+                _ix("ix_tx_goal", ["campaign_goal_id"]),
+                _ix("ix_tx_sponsor", ["sponsor_id"]),
+                _ix("ix_tx_status", ["status"]),
+            ],
+            [],
+        ),
+    ]
+    return changes
+
+def _swap_indexes(table, drop, create):
+    if not _is_postgres():
+        with op.batch_alter_table(table) as batch_op:
+            for name, _, _ in drop:
+                batch_op.drop_index(name)
+            for name, columns, kw in create:
+                batch_op.create_index(name, columns, unique=False, **kw)
+        return
+
+    # CONCURRENTLY doesn't block writes but can't run inside a transaction. New names are
+    # built before the old indexes go, so queries never lose their index; same-name
+    # rebuilds (soft-delete) have to drop first.
+    dropped = {name for name, _, _ in drop}
+    with op.get_context().autocommit_block():
+        for name, columns, kw in create:
+            if name not in dropped:
+                op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, **kw)
+        for name, _, _ in drop:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+        for name, columns, kw in create:
+            if name in dropped:
+                op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, **kw)
+
+def upgrade():
+    # --- sms_logs: length checks only matter on SQLite; VARCHAR(32) bounds Postgres ---
+    if _is_postgres():
+        op.drop_constraint("ck_sms_from_len", "sms_logs", type_="check")
+        op.drop_constraint("ck_sms_to_len", "sms_logs", type_="check")
+
+    for table, before, after in _changes():
+        _swap_indexes(table, before, after)
+
+
+def downgrade():
+    for table, before, after in reversed(_changes()):
+        _swap_indexes(table, after, before)
+
+    if _is_postgres():
+        op.create_check_constraint("ck_sms_to_len", "sms_logs", "length(to_number)   <= 32")
+        op.create_check_constraint("ck_sms_from_len", "sms_logs", "length(from_number) <= 32")
@@ -0,0 +1,66 @@
+"""native uuid columns
+
+Stores public uuids as native 16-byte UUID on Postgres (no-op on SQLite,
+where the column stays VARCHAR(36)).
+
+MAINTENANCE WINDOW: ALTER COLUMN ... TYPE rewrites each table under an
+ACCESS EXCLUSIVE lock (no reads or writes) until the revision commits. Run
+this revision on its own while traffic is drained, e.g.
+`flask db upgrade a5263708d0b1` with the app live, then `flask db upgrade`.
+
+Revision ID: cfc27512bb98
+Revises: a5263708d0b1
+Create Date: 2026-10-17 22:31:47.502916
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "cfc27512bb98"
+down_revision = "a5263708d0b1"
+branch_labels = None
+depends_on = None
+
+UUID_TABLES = ("teams", "campaign_goals", "players", "users", "transactions")
+
+
+# -----------------------------------------------------------------------------
+# Helpers
+# -----------------------------------------------------------------------------
+def _uuid():
+    # Portable: VARCHAR(36) on SQLite, native 16-byte UUID on Postgres (values stay str)
+    return sa.String(length=36).with_variant(postgresql.UUID(as_uuid=False), "postgresql")
+
+def _is_postgres():
+    return op.get_bind().dialect.name == "postgresql"
+
+def upgrade():
+    if not _is_postgres():
+        return
+    for table in UUID_TABLES:
+        op.alter_column(
+            table,
+            "uuid",
+            type_=_uuid(),
+            existing_type=sa.String(length=36),
+            existing_nullable=False,
+            postgresql_using="uuid::uuid",
+        )
+
+
+def downgrade():
+    if not _is_postgres():
+        return
+    for table in reversed(UUID_TABLES):
+        op.alter_column(
+            table,
+            "uuid",
+            type_=sa.String(length=36),
+            existing_type=_uuid(),
+            existing_nullable=False,
+            postgresql_using="uuid::varchar(36)",
+        )
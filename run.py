@@ -111,14 +111,7 @@ def _dotenv_candidates(env: str) -> list[Path]:
     for a in aliases:
         files.append(Path(f".env.{a}"))
 
-    out: list[Path] = []
-    seen: set[str] = set()
-    for p in files:
-        k = str(p)
-        if k not in seen:
-            seen.add(k)
-            out.append(p)
-    return out
+    return list(dict.fromkeys(files))
 
 
 def load_env_stack(*, env: Optional[str] = None, override: bool = False) -> list[Path]:
@@ -310,13 +303,7 @@ def collect_watch_files(dirs: Iterable[Path]) -> list[str]:
         if p.is_file():
             files.append(str(p))
 
-    seen: set[str] = set()
-    out: list[str] = []
-    for f in files:
-        if f not in seen:
-            seen.add(f)
-            out.append(f)
-    return out
+    return list(dict.fromkeys(files))
 
 
 # -----------------------------------------------------------------------------
@@ -864,14 +851,7 @@ def _dotenv_candidates(env: str) -> list[Path]:
         files.append(Path(".env.local"))
 
     # de-dupe while preserving order
-    out: list[Path] = []
-    seen: set[str] = set()
-    for p in files:
-        k = str(p)
-        if k not in seen:
-            seen.add(k)
-            out.append(p)
-    return out
+    return list(dict.fromkeys(files))
 
 
 def load_env_stack(*, env: Optional[str] = None, override: bool = False) -> list[Path]:
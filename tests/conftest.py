@@ -0,0 +1,11 @@
+# tests/conftest.py
+# pytest setup for the Python unit tests; the *.spec.ts files here are Playwright's.
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Repo root for `app.*`; ci/smoke because the smoke scripts import their siblings (`_cf`, `_http`) flat
+for path in (ROOT, ROOT / "ci" / "smoke"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
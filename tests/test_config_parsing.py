@@ -0,0 +1,32 @@
+# tests/test_config_parsing.py
+import pytest
+
+pytest.importorskip("flask")
+config = pytest.importorskip("app.config.config")
+payments_bp = pytest.importorskip("app.blueprints.payments")
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        (None, []),
+        ("", []),
+        (" a, b ,,c ", ["a", "b", "c"]),
+        ("https://x.test", ["https://x.test"]),
+        (["a ", " ", "b"], ["a", "b"]),
+        (("x", 5, " y"), ["x", "5", "y"]),
+        ([], []),
+    ],
+)
+def test_csv(raw, expected):
+    assert config._csv(raw) == expected
+
+
+@pytest.mark.parametrize("raw", [True, "1", "true", " TRUE ", "Yes", "on", "y", 1])
+def test_truthy(raw):
+    assert payments_bp._truthy(raw) is True
+
+
+@pytest.mark.parametrize("raw", [False, None, "", "0", "false", "no", "off", "maybe", 0, 2])
+def test_falsy(raw):
+    assert payments_bp._truthy(raw) is False
@@ -0,0 +1,123 @@
+# tests/test_migration_parity.py
+import importlib.util
+import io
+
+import pytest
+
+sa = pytest.importorskip("sqlalchemy")
+pytest.importorskip("alembic")
+pytest.importorskip("flask_sqlalchemy")
+models = pytest.importorskip("app.models")
+
+import app.models.stripe_event  # noqa: E402,F401  (not in app.models' registry)
+from alembic.migration import MigrationContext  # noqa: E402
+from alembic.operations import Operations  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.mixins import UUID_TYPE  # noqa: E402
+from conftest import ROOT  # noqa: E402
+
+REVISIONS = ("771c31231115_initial_schema", "a5263708d0b1_index_cleanup", "cfc27512bb98_native_uuid")
+
+
+def _revision(name):
+    spec = importlib.util.spec_from_file_location(name, ROOT / "migrations" / "versions" / f"{name}.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _where(clause):
+    return None if clause is None else str(clause)
+
+
+def _migrated_indexes(conn):
+    insp = sa.inspect(conn)
+    return {
+        table: {
+            i["name"]: (
+                tuple(i["column_names"]),
+                bool(i["unique"]),
+                _where(i.get("dialect_options", {}).get("sqlite_where")),
+            )
+            for i in insp.get_indexes(table)
+        }
+        for table in insp.get_table_names()
+    }
+
+
+def _model_indexes(table):
+    return {
+        ix.name: (
+            tuple(c.name for c in ix.columns),
+            bool(ix.unique),
+            _where(ix.dialect_options["sqlite"].get("where")),
+        )
+        for ix in db.metadata.tables[table].indexes
+    }
+
+
+@pytest.fixture()
+def conn():
+    engine = sa.create_engine("sqlite://")
+    with engine.begin() as connection:
+        with Operations.context(MigrationContext.configure(connection)):
+            yield connection
+
+
+def test_head_indexes_match_models(conn):
+    for name in REVISIONS:
+        _revision(name).upgrade()
+    migrated = _migrated_indexes(conn)
+    shared = sorted(set(migrated) & set(db.metadata.tables))
+    assert "sponsors" in shared and "donations" in shared
+    for table in shared:
+        assert migrated[table] == _model_indexes(table), table
+
+
+def test_cleanup_downgrade_restores_the_initial_indexes(conn):
+    initial, cleanup = (_revision(name) for name in REVISIONS[:2])
+    initial.upgrade()
+    before = _migrated_indexes(conn)
+    cleanup.upgrade()
+    assert _migrated_indexes(conn) != before
+    cleanup.downgrade()
+    assert _migrated_indexes(conn) == before
+
+
+def _postgres_sql(fn):
+    buf = io.StringIO()
+    ctx = MigrationContext.configure(dialect_name="postgresql", opts={"as_sql": True, "output_buffer": buf})
+    with Operations.context(ctx):
+        fn()
+    return buf.getvalue()
+
+
+def test_postgres_covering_indexes_match_models():
+    sql = _postgres_sql(_revision(REVISIONS[1]).upgrade)
+    covering = [
+        (table, ix)
+        for table, t in db.metadata.tables.items()
+        for ix in t.indexes
+        if ix.dialect_options["postgresql"].get("include")
+    ]
+    assert covering
+    for table, ix in covering:
+        cols = ", ".join(c.name for c in ix.columns)
+        include = ", ".join(ix.dialect_options["postgresql"]["include"])
+        assert f"CREATE INDEX CONCURRENTLY {ix.name} ON {table} ({cols}) INCLUDE ({include})" in sql
+
+
+@pytest.mark.parametrize("step", ["upgrade", "downgrade"])
+def test_postgres_index_changes_never_block_writes(step):
+    sql = _postgres_sql(getattr(_revision(REVISIONS[1]), step))
+    statements = [s.strip() for s in sql.split(";") if "INDEX" in s]
+    assert statements
+    assert all(" INDEX CONCURRENTLY " in s for s in statements)
+
+
+def test_postgres_uuid_columns_are_converted_to_the_model_type():
+    sql = _postgres_sql(_revision(REVISIONS[2]).upgrade)
+    uuid_tables = [t.name for t in db.metadata.tables.values() if "uuid" in t.c and t.c.uuid.type is UUID_TYPE]
+    assert uuid_tables
+    for table in uuid_tables:
+        assert f"ALTER TABLE {table} ALTER COLUMN uuid TYPE UUID USING uuid::uuid" in sql
@@ -0,0 +1,52 @@
+# tests/test_payment_service.py
+import hashlib
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("stripe")
+services = pytest.importorskip("app.services.payments")
+
+from flask import Flask  # noqa: E402
+
+
+@pytest.fixture()
+def stripe_calls(monkeypatch):
+    monkeypatch.delenv("DEMO_MODE", raising=False)
+    calls = []
+
+    def fake_create(**params):
+        calls.append(params)
+        return SimpleNamespace(client_secret="cs_test", id="pi_test")
+
+    monkeypatch.setattr(services.stripe.PaymentIntent, "create", fake_create)
+    app = Flask(__name__)
+    app.config.update(DEMO_MODE="0", STRIPE_SECRET_KEY="sk_test_x")
+    with app.app_context():
+        yield calls
+
+
+def _key(idem, amount_cents):
+    digest = hashlib.sha256(f"ff|svc|{idem}|amt:{amount_cents}".encode("utf-8")).hexdigest()[:48]
+    return f"ff_pi_{digest}"
+
+
+def test_client_key_is_forwarded_as_a_derived_stripe_key(stripe_calls):
+    services.PaymentService.create_stripe_intent({"amount": 25, "idempotency_key": " abc "})
+    services.PaymentService.create_stripe_intent({"amount": 25, "idempotencyKey": "abc"})
+    first, retry = stripe_calls
+    assert first["idempotency_key"] == retry["idempotency_key"] == _key("abc", 2500)
+
+
+def test_amount_is_part_of_the_key(stripe_calls):
+    services.PaymentService.create_stripe_intent({"amount": 25, "idempotency_key": "abc"})
+    services.PaymentService.create_stripe_intent({"amount": 30, "idempotency_key": "abc"})
+    assert stripe_calls[0]["idempotency_key"] != stripe_calls[1]["idempotency_key"]
+    assert stripe_calls[1]["idempotency_key"] == _key("abc", 3000)
+
+
+@pytest.mark.parametrize("data", [{"amount": 25}, {"amount": 25, "idempotency_key": "  "}])
+def test_no_key_without_a_client_key(stripe_calls, data):
+    services.PaymentService.create_stripe_intent(data)
+    assert "idempotency_key" not in stripe_calls[0]
@@ -0,0 +1,114 @@
+# tests/test_polish_css.py
+import importlib.util
+import re
+
+import pytest
+
+from conftest import ROOT
+
+_spec = importlib.util.spec_from_file_location("polish_css", ROOT / "app/templates/partials/polish_css.py")
+polish_css = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(polish_css)
+
+CSS = """\
+.fc-hero-wordmark { opacity: 0.4; z-index: 3; color: red; }
+.feature-tile{background: linear-gradient(90deg, #000, #111);box-shadow: none;}
+.unrelated { opacity: 1; z-index: 9; }
+@media (max-width: 600px) {
+  .tile-title { font-size: 1rem; text-shadow: none; }
+  .badge { margin-bottom: 2px; }
+}
+.fc-hero-cta .btn.gold { box-shadow: none; }
+.footer-donate { vertical-align: top; }
+.fc-hero-photo { z-index: 0; }
+"""
+
+
+def _sequential(css):
+    """The pre-tokenizer approach: one whole-file re.sub per (selector, declaration) pair."""
+    for sel, edits in polish_css.patches:
+        prefix = f"({sel}[^{{]*\\{{[^\\}}]*?)"
+        for decl, repl in edits:
+            if decl is None:
+                css = re.sub(prefix + "(})", lambda m: m.group(1) + repl + m.group(2), css, flags=re.MULTILINE)
+            else:
+                css = re.sub(prefix + decl, lambda m: m.group(1) + repl, css, flags=re.MULTILINE)
+    return css
+
+
+def _tokenized(css):
+    return polish_css.BLOCK_RE.sub(
+        lambda m: m.group(1) + "{" + polish_css.patch_block(m.group(1), m.group(2), polish_css.COMPILED_PATCHES) + "}",
+        css,
+    )
+
+
+def test_tokenizer_matches_sequential_patches():
+    patched = _tokenized(CSS)
+    assert patched != CSS
+    assert patched == _sequential(CSS)
+
+
+def test_nested_and_unmatched_blocks():
+    patched = _tokenized(CSS)
+    assert ".tile-title { font-size: 1.36rem; text-shadow: 0 2px 8px #0005; margin-top: 0.3em;}" in patched
+    assert ".unrelated { opacity: 1; z-index: 9; }" in patched
+
+
+def test_patch_file_rewrites_only_on_change(tmp_path):
+    css = tmp_path / "a.css"
+    css.write_text(CSS)
+    polish_css.patch_file(str(css), polish_css.COMPILED_PATCHES)
+    assert css.read_text() == _sequential(CSS)
+
+    clean = tmp_path / "b.css"
+    clean.write_text(".unrelated { color: red; }")
+    before = clean.stat().st_mtime_ns
+    polish_css.patch_file(str(clean), polish_css.COMPILED_PATCHES)
+    assert clean.stat().st_mtime_ns == before
+
+
+@pytest.fixture()
+def cache_path(tmp_path, monkeypatch):
+    path = tmp_path / ".polish_css.cache.json"
+    monkeypatch.setattr(polish_css, "CACHE_PATH", str(path))
+    return path
+
+
+def test_cache_round_trips_for_the_same_patch_version(cache_path):
+    files = {"app/static/css/a.css": [1, 2]}
+    polish_css.save_cache(polish_css.PATCHES_VERSION, files)
+    assert polish_css.load_cache(polish_css.PATCHES_VERSION) == files
+
+
+def test_cache_is_dropped_when_the_patch_list_changes(cache_path):
+    polish_css.save_cache(polish_css.PATCHES_VERSION, {"app/static/css/a.css": [1, 2]})
+    assert polish_css.load_cache("some-other-version") == {}
+
+
+@pytest.mark.parametrize("content", [None, "", "{not json"])
+def test_missing_or_corrupt_cache_is_empty(cache_path, content):
+    if content is not None:
+        cache_path.write_text(content)
+    assert polish_css.load_cache(polish_css.PATCHES_VERSION) == {}
+
+
+def test_stat_key_changes_when_a_file_is_edited(tmp_path):
+    css = tmp_path / "a.css"
+    css.write_text(".a { color: red; }")
+    before = polish_css._stat_key(str(css))
+    css.write_text(".a { color: blue; z-index: 1; }")
+    assert polish_css._stat_key(str(css)) != before
+
+
+def test_second_pass_is_a_no_op():
+    once = _tokenized(CSS)
+    assert _tokenized(once) == once
+
+
+def test_save_cache_creates_its_directory(tmp_path, monkeypatch):
+    path = tmp_path / ".cache" / "polish_css.json"
+    monkeypatch.setattr(polish_css, "CACHE_PATH", str(path))
+    polish_css.save_cache(polish_css.PATCHES_VERSION, {})
+    assert polish_css.load_cache(polish_css.PATCHES_VERSION) == {}
+    assert path.exists()
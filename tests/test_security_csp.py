@@ -0,0 +1,53 @@
+# tests/test_security_csp.py
+import re
+
+import pytest
+
+pytest.importorskip("flask")
+security = pytest.importorskip("app.security")
+
+from flask import Flask, render_template_string  # noqa: E402
+
+NONCE_RE = re.compile(r"'nonce-([^']+)'")
+
+
+@pytest.fixture()
+def client():
+    app = Flask(__name__)
+    security.attach_csp(app)
+
+    @app.get("/nonced")
+    def nonced():
+        return render_template_string("<script nonce=\"{{ csp_nonce() }}\"></script>")
+
+    @app.get("/plain")
+    def plain():
+        return "ok"
+
+    return app.test_client()
+
+
+def test_header_carries_the_nonce_rendered_into_the_page(client):
+    r = client.get("/nonced")
+    header = r.headers["Content-Security-Policy"]
+    (n,) = NONCE_RE.findall(header)
+    assert f'nonce="{n}"'.encode() in r.data
+    assert f"script-src  'self' https://js.stripe.com 'nonce-{n}';" in header
+
+
+def test_only_the_nonce_changes_between_requests(client):
+    first = client.get("/nonced").headers["Content-Security-Policy"]
+    second = client.get("/nonced").headers["Content-Security-Policy"]
+    assert NONCE_RE.findall(first) != NONCE_RE.findall(second)
+    assert NONCE_RE.sub("'nonce-x'", first) == NONCE_RE.sub("'nonce-x'", second)
+
+
+def test_no_nonce_source_when_the_page_never_asked_for_one(client):
+    header = client.get("/plain").headers["Content-Security-Policy"]
+    assert "'nonce-" not in header
+    assert header.startswith("default-src 'self' https:; script-src  'self' https://js.stripe.com; ")
+
+
+def test_debug_skips_the_header(client):
+    client.application.debug = True
+    assert "Content-Security-Policy" not in client.get("/plain").headers
@@ -0,0 +1,53 @@
+# tests/test_smoke_cf.py
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from _cf import cf_tunnel_error, served_by_cloudflare  # noqa: E402
+
+
+def _resp(status, body=b"", server="cloudflare"):
+    r = requests.Response()
+    r.status_code = status
+    r._content = body
+    if server is not None:
+        r.headers["Server"] = server
+    return r
+
+
+@pytest.mark.parametrize("status", [530, 1033])
+def test_tunnel_error_statuses(status):
+    assert cf_tunnel_error(_resp(status))
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"<title>Cloudflare Tunnel error</title>",
+        b"<h1>Error 1033</h1> Argo Tunnel error",
+        b"ARGO TUNNEL is not connected",
+    ],
+)
+def test_tunnel_error_page_bodies(body):
+    assert cf_tunnel_error(_resp(502, body))
+
+
+def test_needle_past_the_sniffed_prefix_is_ignored():
+    assert not cf_tunnel_error(_resp(502, b"x" * 4096 + b"error 1033"))
+
+
+def test_app_responses_through_cloudflare_are_not_tunnel_errors():
+    assert served_by_cloudflare(_resp(200, b"ok"))
+    assert not cf_tunnel_error(_resp(200, b"ok"))
+    assert not cf_tunnel_error(_resp(404, b"<h1>Not Found</h1>"))
+
+
+@pytest.mark.parametrize("server", [None, "gunicorn", "nginx"])
+def test_not_cloudflare(server):
+    r = _resp(530, b"error 1033", server=server)
+    assert not served_by_cloudflare(r)
+    assert not cf_tunnel_error(r)
+
+
+def test_empty_body():
+    assert not cf_tunnel_error(_resp(502, None))